@@ -0,0 +1,201 @@
+﻿import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import jsonify, make_response
+
+
+class Limiter:
+    # Batas request bersamaan per route + antrean tunggu terbatas. Jika penuh
+    # atau waktu tunggu habis, request langsung ditolak (503) alih-alih menumpuk.
+    def __init__(self, name: str, limit: int, queue: int, wait_s: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue = max(0, queue)
+        self.wait_s = wait_s
+        self.active = 0
+        self.waiting = 0
+        self.cond = threading.Condition()
+        self.counters = {"admitted": 0, "queued": 0, "rejected_full": 0, "rejected_timeout": 0, "peak_active": 0}
+
+    def acquire(self) -> bool:
+        with self.cond:
+            if self.active >= self.limit:
+                if self.waiting >= self.queue:
+                    self.counters["rejected_full"] += 1
+                    return False
+                self.counters["queued"] += 1
+                self.waiting += 1
+                deadline = time.monotonic() + self.wait_s
+                try:
+                    while self.active >= self.limit:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.counters["rejected_timeout"] += 1
+                            return False
+                        self.cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self.counters["admitted"] += 1
+            self.counters["peak_active"] = max(self.counters["peak_active"], self.active)
+            return True
+
+    def release(self) -> None:
+        with self.cond:
+            self.active -= 1
+            self.cond.notify()
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.wait_s))
+
+    def stats(self) -> dict:
+        with self.cond:
+            return {
+                "limit": self.limit,
+                "queue": self.queue,
+                "active": self.active,
+                "waiting": self.waiting,
+                **self.counters,
+            }
+
+
+class CircuitBreaker:
+    # closed -> open setelah `threshold` gagal berturut-turut; setelah `cooldown_s`
+    # satu request percobaan (half_open) dilepas untuk menguji upstream lagi.
+    def __init__(self, name: str, threshold: int, cooldown_s: float):
+        self.name = name
+        self.threshold = max(1, threshold)
+        self.cooldown_s = cooldown_s
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+        self.lock = threading.Lock()
+        self.counters = {"opened": 0, "short_circuited": 0, "stale_served": 0}
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown_s and not self.probing:
+                self.probing = True
+                return True
+            self.counters["short_circuited"] += 1
+            return False
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.probing or (self.opened_at is None and self.failures >= self.threshold):
+                # Percobaan half_open gagal juga membuka ulang sirkuit.
+                self.counters["opened"] += 1
+                self.opened_at = time.monotonic()
+                self.probing = False
+
+    def note_stale(self) -> None:
+        with self.lock:
+            self.counters["stale_served"] += 1
+
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if self.probing else "open"
+
+    def retry_after(self) -> int:
+        with self.lock:
+            if self.opened_at is None:
+                return 1
+            return max(1, math.ceil(self.cooldown_s - (time.monotonic() - self.opened_at)))
+
+    def stats(self) -> dict:
+        with self.lock:
+            counters = dict(self.counters)
+            failures = self.failures
+        return {"state": self.state(), "failures": failures, "threshold": self.threshold, **counters}
+
+
+class StaleCache:
+    # LRU berbatas byte: salinan terakhir yang berhasil diambil dari Drive,
+    # dipakai saat circuit breaker terbuka atau fetch gagal.
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.items: OrderedDict[str, bytes] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.items.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self.items[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, dropped = self.items.popitem(last=False)
+                self.size -= len(dropped)
+
+    def get(self, key: str) -> bytes | None:
+        with self.lock:
+            data = self.items.get(key)
+            if data is not None:
+                self.items.move_to_end(key)
+            return data
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {"entries": len(self.items), "bytes": self.size, "max_bytes": self.max_bytes}
+
+
+def unavailable(retry_after: int, message: str = "Server sedang sibuk, coba lagi."):
+    resp = jsonify({"ok": False, "message": message})
+    resp.status_code = 503
+    resp.headers["Retry-After"] = str(retry_after)
+    return resp
+
+
+class Rejected(Exception):
+    # Dilempar oleh slot(); app mengubahnya menjadi 503 + Retry-After.
+    def __init__(self, retry_after: int):
+        super().__init__("Server sedang sibuk, coba lagi.")
+        self.retry_after = retry_after
+
+
+@contextmanager
+def slot(limiter: Limiter):
+    # Versi blok dari @limited: hanya bagian mahal (cache miss) yang memakai
+    # slot, jadi respons dari cache tidak ikut antre di belakang render dingin.
+    if not limiter.acquire():
+        raise Rejected(limiter.retry_after())
+    try:
+        yield
+    finally:
+        limiter.release()
+
+
+def limited(limiter: Limiter):
+    # Slot dilepas saat respons ditutup, jadi respons streaming tetap terhitung.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not limiter.acquire():
+                return unavailable(limiter.retry_after())
+            try:
+                resp = make_response(view(*args, **kwargs))
+            except BaseException:
+                limiter.release()
+                raise
+            resp.call_on_close(limiter.release)
+            return resp
+        return wrapper
+    return decorator
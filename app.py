@@ -1,11 +1,28 @@
 ﻿from pathlib import Path
+import gzip
+import hashlib
+import hmac
+import io
+import json
+import math
 import os
+import re
 import subprocess
 import sys
-import re
+import time
 import urllib.request
 
-from flask import Flask, render_template, request, redirect, url_for, jsonify, Response
+from flask import Flask, render_template, request, redirect, url_for, jsonify, Response, send_file
+
+import admission
+import asset_store
+import inverse_design
+import jobs
+import response_model
+import shared_cache
+import trace_io
+from svg_plot import render_trace_svg
+from trace_pyramid import build_pyramid, flatten_pyramid, query_pyramid, unflatten_pyramid
 
 
 app = Flask(__name__)
@@ -28,6 +45,58 @@ DRIVE_TXT_INDEX: dict[str, str] = {}
 DRIVE_IMG_READY = False
 DRIVE_TXT_READY = False
 
+# "matplotlib" (PNG hasil generate_graphs.py) atau "svg" (renderer bawaan, tanpa matplotlib)
+GRAPH_RENDERER = os.getenv("GRAPH_RENDERER", "matplotlib").lower()
+# Khusus renderer svg: data sudut (pola) digambar sebagai grafik polar.
+GRAPH_POLAR = os.getenv("GRAPH_POLAR", "0").lower() in {"1", "true", "yes", "on"}
+
+# Piramida min/max per trace untuk /api/trace (zoom dan tooltip).
+TRACE_PYRAMIDS: dict[tuple[str, float, str], dict] = {}
+PYRAMID_MAX_POINTS = 1 << 20
+TRACE_MAX_WIDTH = 4096
+
+# /api/bundle: satu respons JSON (gzip + ETag) per frekuensi.
+BUNDLE_CACHE: dict[float, dict] = {}
+BUNDLE_TRACE_WIDTH = 600
+GRAPH_META_CACHE: dict[tuple[str, float, str], dict] = {}
+
+# Model interpolasi respons antar dataset (scripts/build_response_model.py).
+RESPONSE_MODEL_PATH = Path(os.getenv("RESPONSE_MODEL_PATH", str(asset_store.STORE_ROOT / "response_model.npz")))
+RESPONSE_MODELS: dict[tuple[str, str], dict] | None = None
+# npz yang lebih tua dari invalidasi terakhir dianggap basi dan dibangun ulang.
+RESPONSE_MODEL_MIN_MTIME = 0.0
+RESPONSE_MODEL_RETRY_S = 5
+
+# Job latar (sync Drive, rebuild grafik) untuk /api/jobs.
+JOBS_STATE_PATH = Path(os.getenv("JOBS_STATE_PATH", str(asset_store.STORE_ROOT / "jobs.json")))
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "2"))
+JOBS_TOKEN = os.getenv("JOBS_TOKEN", "")
+# Admission control (per proses): batas request bersamaan untuk route proxy Drive
+# dan route render, plus circuit breaker + salinan basi saat Drive gagal.
+ADMISSION_WAIT_S = float(os.getenv("ADMISSION_WAIT_S", "2"))
+DRIVE_LIMITER = admission.Limiter(
+    "drive",
+    int(os.getenv("ADMISSION_DRIVE_LIMIT", "8")),
+    int(os.getenv("ADMISSION_DRIVE_QUEUE", "16")),
+    ADMISSION_WAIT_S,
+)
+RENDER_LIMITER = admission.Limiter(
+    "render",
+    int(os.getenv("ADMISSION_RENDER_LIMIT", "2")),
+    int(os.getenv("ADMISSION_RENDER_QUEUE", "4")),
+    ADMISSION_WAIT_S,
+)
+DRIVE_BREAKER = admission.CircuitBreaker(
+    "drive",
+    int(os.getenv("DRIVE_BREAKER_FAILURES", "5")),
+    float(os.getenv("DRIVE_BREAKER_COOLDOWN_S", "30")),
+)
+DRIVE_STALE = admission.StaleCache(int(os.getenv("DRIVE_STALE_CACHE_MB", "64")) << 20)
+
+# Versi shared_cache terakhir yang dilihat proses ini (lihat sync_cache_version).
+LOCAL_CACHE_VERSION = shared_cache.version()
+REBUILD_PROGRESS_RE = re.compile(r"^\[(\d+)/(\d+)\] (.*)$")
+
 
 C0 = 3e8  # m/s
 FREQ_OPTIONS_GHZ = [1.8, 2.2, 2.3, 2.4, 3.3]  # sesuai PDF
@@ -61,12 +130,6 @@ TXT_FREQ_DIR = {
         3.3: ("3.3",),
     },
 }
-TXT_KIND_KEYWORDS = {
-    "gain": ("gain",),
-    "return_loss": ("return", "rl", "sparameter"),
-    "vswr": ("vswr",),
-    "pola": ("pola",),
-}
 
 
 
@@ -95,11 +158,16 @@ def _load_drive_index(url: str) -> dict[str, str]:
     return index
 
 
+def _shared_drive_index(url: str) -> dict[str, str]:
+    # Satu worker merayapi Drive, worker lain membaca hasilnya dari shared_cache.
+    return shared_cache.fill_json(f"drive_index:{url}", lambda: _load_drive_index(url) or None) or {}
+
+
 def ensure_drive_img_index() -> None:
     global DRIVE_IMG_READY, DRIVE_IMG_INDEX
     if DRIVE_IMG_READY:
         return
-    index = _load_drive_index(IMG_DRIVE_FOLDER_URL)
+    index = _shared_drive_index(IMG_DRIVE_FOLDER_URL)
     if index:
         DRIVE_IMG_INDEX = index
         DRIVE_IMG_READY = True
@@ -109,7 +177,7 @@ def ensure_drive_txt_index() -> None:
     global DRIVE_TXT_READY, DRIVE_TXT_INDEX
     if DRIVE_TXT_READY:
         return
-    index = _load_drive_index(GDRIVE_FOLDER_URL)
+    index = _shared_drive_index(GDRIVE_FOLDER_URL)
     if index:
         DRIVE_TXT_INDEX = index
         DRIVE_TXT_READY = True
@@ -132,7 +200,7 @@ def drive_img_url(rel_path: str) -> str | None:
     return url_for("drive_img", rel_path=rel_path)
 
 
-def drive_txt_file_id(freq_ghz: float, source: str, kind: str) -> str | None:
+def drive_txt_file(freq_ghz: float, source: str, kind: str) -> tuple[str, str] | None:
     ensure_drive_txt_index()
     source_key = source.upper()
     if source_key not in TXT_FREQ_DIR:
@@ -141,58 +209,136 @@ def drive_txt_file_id(freq_ghz: float, source: str, kind: str) -> str | None:
     if not dir_parts:
         return None
     prefix = "/".join([source_key, *dir_parts]).strip("/")
-    keywords = TXT_KIND_KEYWORDS.get(kind, ())
     for path, file_id in DRIVE_TXT_INDEX.items():
         if not path.startswith(prefix + "/"):
             continue
-        name = path.split("/")[-1].lower()
-        if any(key in name for key in keywords):
-            return file_id
+        if trace_io.name_matches_kind(path.split("/")[-1], kind):
+            return path, file_id
     return None
 
 
+def drive_txt_file_id(freq_ghz: float, source: str, kind: str) -> str | None:
+    entry = drive_txt_file(freq_ghz, source, kind)
+    return entry[1] if entry else None
+
+
 def fetch_drive_file_bytes(file_id: str) -> bytes | None:
+    if not DRIVE_BREAKER.allow():
+        return None
     try:
         with urllib.request.urlopen(drive_file_url(file_id)) as resp:
-            return resp.read()
+            data = resp.read()
     except Exception as exc:
+        DRIVE_BREAKER.record_failure()
         print(f"[gdrive] gagal fetch file: {exc}")
         return None
+    DRIVE_BREAKER.record_success()
+    DRIVE_STALE.put(file_id, data)
+    return data
 
 
-
-def sync_gdrive_folder() -> bool:
-    if not SYNC_GDRIVE_ON_START:
-        return False
-    if (not SYNC_GDRIVE_FORCE) and SYNC_MARKER_PATH.exists():
-        return False
+def open_drive_file(file_id: str):
+    if not DRIVE_BREAKER.allow():
+        return None
     try:
-        import gdown
+        resp = urllib.request.urlopen(drive_file_url(file_id))
     except Exception as exc:
-        print(f"[gdrive] gdown tidak tersedia: {exc}")
-        return False
+        DRIVE_BREAKER.record_failure()
+        print(f"[gdrive] gagal fetch file: {exc}")
+        return None
+    DRIVE_BREAKER.record_success()
+    return resp
 
-    dest = STATIC_ROOT / "gambar cst file"
-    dest.mkdir(parents=True, exist_ok=True)
-    try:
-        files = gdown.download_folder(
-            url=GDRIVE_FOLDER_URL,
-            output=str(dest),
-            quiet=True,
-            remaining_ok=True,
-            resume=True,
-        )
-    except Exception as exc:
-        print(f"[gdrive] gagal sync: {exc}")
-        return False
 
+def stale_drive_file(file_id: str) -> bytes | None:
+    data = DRIVE_STALE.get(file_id)
+    if data is not None:
+        DRIVE_BREAKER.note_stale()
+    return data
+
+
+def drive_unavailable():
+    # Sirkuit terbuka: tolak cepat dengan Retry-After, bukan 502 setelah timeout.
+    if DRIVE_BREAKER.state() == "closed":
+        return "", 502
+    return admission.unavailable(DRIVE_BREAKER.retry_after(), "Google Drive sedang tidak tersedia.")
+
+
+def iter_stream_bytes(resp, chunk_size: int = 65536, stale_key: str | None = None):
+    # Dengan stale_key, file kecil disalin ke DRIVE_STALE sambil di-stream.
+    kept: list[bytes] | None = [] if stale_key else None
+    size = 0
+    with resp:
+        for chunk in iter(lambda: resp.read(chunk_size), b""):
+            if kept is not None:
+                size += len(chunk)
+                if size > DRIVE_STALE.max_bytes // 16:
+                    kept = None
+                else:
+                    kept.append(chunk)
+            yield chunk
+    if kept is not None:
+        DRIVE_STALE.put(stale_key, b"".join(kept))
+
+
+def open_drive_txt_lines(path: str, file_id: str):
+    # Salinan di asset store (hasil scripts/build_asset_store.py) dipakai lebih dulu.
+    blob = asset_store.resolve(f"gambar cst file/{path}")
+    if blob is not None:
+        return trace_io.open_lines(blob)
+    resp = open_drive_file(file_id)
+    if resp is None:
+        stale = stale_drive_file(file_id)
+        return trace_io.stream_lines(io.BytesIO(stale)) if stale is not None else None
+    return trace_io.stream_lines(resp)
+
+
+
+def _sync_drive_folder(url: str, dest: Path, marker: Path, label: str, progress=None) -> int:
+    import gdown
+
+    dest.mkdir(parents=True, exist_ok=True)
+    # Daftar file dulu, lalu unduh satu per satu supaya progres per file terlihat.
+    files = gdown.download_folder(url=url, output=str(dest), skip_download=True, quiet=True, remaining_ok=True)
     if not files:
-        return False
+        raise RuntimeError(f"folder {label} kosong atau tidak bisa dibaca")
+    total = len(files)
+    for idx, item in enumerate(files, start=1):
+        target = dest / _normalize_drive_path(item.path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        gdown.download(id=item.id, output=str(target), quiet=True, resume=True)
+        if progress:
+            progress(idx, total, _normalize_drive_path(item.path))
     try:
-        SYNC_MARKER_PATH.write_text("ok", encoding="utf-8")
+        marker.write_text("ok", encoding="utf-8")
     except Exception:
         pass
-    print(f"[gdrive] sync selesai: {len(files)} file")
+    print(f"[gdrive] sync {label} selesai: {total} file")
+    return total
+
+
+def run_drive_sync(target: str, progress=None) -> dict:
+    if target == "img":
+        count = _sync_drive_folder(IMG_DRIVE_FOLDER_URL, STATIC_ROOT / "img", IMG_SYNC_MARKER_PATH, "img", progress)
+    elif target == "txt":
+        count = _sync_drive_folder(GDRIVE_FOLDER_URL, STATIC_ROOT / "gambar cst file", SYNC_MARKER_PATH, "txt", progress)
+    else:
+        raise ValueError("Target sync tidak dikenal.")
+    refresh_asset_store()
+    clear_trace_caches()
+    result = {"files": count}
+    if target == "txt" and SYNC_REBUILD_GRAPHS:
+        job, _ = JOBS.submit("rebuild")
+        result["rebuild_job"] = job["id"]
+    return result
+
+
+def sync_gdrive_folder() -> bool:
+    if not SYNC_GDRIVE_ON_START:
+        return False
+    if (not SYNC_GDRIVE_FORCE) and SYNC_MARKER_PATH.exists():
+        return False
+    JOBS.submit("sync", {"target": "txt"})
     return True
 
 
@@ -201,54 +347,117 @@ def sync_img_folder() -> bool:
         return False
     if (not IMG_SYNC_FORCE) and IMG_SYNC_MARKER_PATH.exists():
         return False
-    try:
-        import gdown
-    except Exception as exc:
-        print(f"[gdrive] gdown tidak tersedia: {exc}")
-        return False
-
-    dest = STATIC_ROOT / "img"
-    dest.mkdir(parents=True, exist_ok=True)
-    try:
-        files = gdown.download_folder(
-            url=IMG_DRIVE_FOLDER_URL,
-            output=str(dest),
-            quiet=True,
-            remaining_ok=True,
-            resume=True,
-        )
-    except Exception as exc:
-        print(f"[gdrive] gagal sync img: {exc}")
-        return False
-
-    if not files:
-        return False
-    try:
-        IMG_SYNC_MARKER_PATH.write_text("ok", encoding="utf-8")
-    except Exception:
-        pass
-    print(f"[gdrive] sync img selesai: {len(files)} file")
+    JOBS.submit("sync", {"target": "img"})
     return True
 
 
-def rebuild_graphs() -> None:
+def run_graph_rebuild(progress=None) -> dict:
     script_path = Path(__file__).resolve().parent / "scripts" / "generate_graphs.py"
     if not script_path.exists():
-        print("[gdrive] scripts/generate_graphs.py tidak ditemukan.")
+        raise RuntimeError("scripts/generate_graphs.py tidak ditemukan.")
+    proc = subprocess.Popen(
+        [sys.executable, str(script_path), "--renderer", GRAPH_RENDERER, *(["--polar"] if GRAPH_POLAR else [])],
+        stdout=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    done = 0
+    for line in proc.stdout:
+        match = REBUILD_PROGRESS_RE.match(line.strip())
+        if match and progress:
+            done = int(match.group(1))
+            progress(done, int(match.group(2)), match.group(3))
+    if proc.wait() != 0:
+        raise RuntimeError(f"generate_graphs.py keluar dengan kode {proc.returncode}")
+    refresh_asset_store()
+    clear_trace_caches()
+    print("[gdrive] grafik diperbarui.")
+    return {"files": done}
+
+
+def rebuild_graphs() -> dict:
+    job, _ = JOBS.submit("rebuild")
+    return job
+
+
+def refresh_asset_store() -> None:
+    # Store dipakai lebih dulu daripada static/, jadi setelah sync/rebuild
+    # isinya harus diperbarui; entri yang sudah di-prune tetap dipertahankan.
+    if not asset_store.store_exists():
         return
     try:
-        subprocess.run([sys.executable, str(script_path)], check=True)
-        print("[gdrive] grafik diperbarui.")
-    except Exception as exc:
-        print(f"[gdrive] gagal update grafik: {exc}")
+        stats = asset_store.build_store(STATIC_ROOT, keep_existing=True)
+    except OSError as exc:
+        print(f"[store] gagal memperbarui asset store: {exc}")
+        return
+    print(f"[store] asset store diperbarui: {stats['files']} file, {stats['blobs']} blob")
+
+
+def invalidate_response_models() -> None:
+    # Berlaku di kedua mode: mode Drive juga membaca trace dari blob asset store
+    # yang ikut diperbarui setelah sync.
+    global RESPONSE_MODELS, RESPONSE_MODEL_MIN_MTIME
+    RESPONSE_MODELS = None
+    RESPONSE_MODEL_MIN_MTIME = time.time()
+
+
+def clear_trace_caches() -> None:
+    global LOCAL_CACHE_VERSION
+    asset_store.reset_manifest()
+    TRACE_PYRAMIDS.clear()
+    GRAPH_META_CACHE.clear()
+    BUNDLE_CACHE.clear()
+    invalidate_response_models()
+    # Naikkan versi bersama supaya worker lain ikut membuang cache-nya.
+    LOCAL_CACHE_VERSION = shared_cache.bump_version()
+
+
+def sync_cache_version() -> None:
+    global LOCAL_CACHE_VERSION, DRIVE_IMG_READY, DRIVE_TXT_READY
+    current = shared_cache.version()
+    if current == LOCAL_CACHE_VERSION:
+        return
+    asset_store.reset_manifest()
+    TRACE_PYRAMIDS.clear()
+    GRAPH_META_CACHE.clear()
+    BUNDLE_CACHE.clear()
+    invalidate_response_models()
+    DRIVE_IMG_READY = False
+    DRIVE_TXT_READY = False
+    LOCAL_CACHE_VERSION = current
+
+
+JOBS = jobs.JobRunner(JOBS_STATE_PATH, max_workers=JOBS_WORKERS)
+JOBS.register("sync", run_drive_sync)
+JOBS.register("rebuild", run_graph_rebuild)
 
 
 def maybe_sync_on_start() -> None:
+    # Sync berjalan sebagai job latar, jadi start server tidak tertahan.
+    sync_gdrive_folder()
+    sync_img_folder()
     if USE_DRIVE_ASSETS:
         ensure_drive_img_index()
         ensure_drive_txt_index()
 
 
+def local_asset_path(relpath: str) -> Path | None:
+    blob = asset_store.resolve(relpath)
+    if blob is not None:
+        return blob
+    path = STATIC_ROOT / relpath
+    return path if path.exists() else None
+
+
+def static_asset_url(relpath: str) -> str:
+    entry = asset_store.blob_for(relpath)
+    if entry:
+        digest, ext = entry
+        return url_for("asset_blob", name=f"{digest}.{ext}" if ext else digest)
+    return url_for("static", filename=relpath)
+
+
 def cst_image_relpath(freq_ghz: float, filename: str) -> str:
     freq_dir = CST_FREQ_DIR.get(freq_ghz)
     if not freq_dir:
@@ -270,11 +479,11 @@ def cst_image_urls(freq_ghz: float) -> dict:
             "vswr": drive_img_url(f"{base}/VSWR.png"),
         }
     return {
-        "antena": url_for("static", filename=cst_image_relpath(freq_ghz, "antena.png")),
-        "gain": url_for("static", filename=cst_image_relpath(freq_ghz, "gain.png")),
-        "pola": url_for("static", filename=cst_image_relpath(freq_ghz, "pola.png")),
-        "return_loss": url_for("static", filename=cst_image_relpath(freq_ghz, "RETURN LOSS.png")),
-        "vswr": url_for("static", filename=cst_image_relpath(freq_ghz, "VSWR.png")),
+        "antena": static_asset_url(cst_image_relpath(freq_ghz, "antena.png")),
+        "gain": static_asset_url(cst_image_relpath(freq_ghz, "gain.png")),
+        "pola": static_asset_url(cst_image_relpath(freq_ghz, "pola.png")),
+        "return_loss": static_asset_url(cst_image_relpath(freq_ghz, "RETURN LOSS.png")),
+        "vswr": static_asset_url(cst_image_relpath(freq_ghz, "VSWR.png")),
     }
 
 def graph_image_relpath(freq_ghz: float, source: str, filename: str) -> str:
@@ -285,10 +494,17 @@ def graph_image_relpath(freq_ghz: float, source: str, filename: str) -> str:
 
 
 def graph_image_urls(freq_ghz: float, source: str = "CST") -> dict:
+    ext = "svg" if GRAPH_RENDERER == "svg" else "png"
     if USE_DRIVE_ASSETS:
         freq_dir = GRAPH_FREQ_DIR.get(freq_ghz)
         if not freq_dir:
             raise ValueError("Frekuensi tidak tersedia.")
+        if ext == "svg":
+            return {
+                kind: url_for("drive_plot", source=source, freq=freq_ghz, kind=kind)
+                if drive_txt_file_id(freq_ghz, source, kind) else None
+                for kind in ("gain", "return_loss", "vswr", "pola")
+            }
         base = f"grafik cst/{source}/{freq_dir}"
         return {
             "gain": drive_img_url(f"{base}/gain.png"),
@@ -299,15 +515,15 @@ def graph_image_urls(freq_ghz: float, source: str = "CST") -> dict:
 
     def build_url(filename: str) -> str | None:
         relpath = graph_image_relpath(freq_ghz, source, filename)
-        if not (STATIC_ROOT / relpath).exists():
+        if local_asset_path(relpath) is None:
             return None
-        return url_for("static", filename=relpath)
+        return static_asset_url(relpath)
 
     return {
-        "gain": build_url("gain.png"),
-        "return_loss": build_url("return_loss.png"),
-        "vswr": build_url("vswr.png"),
-        "pola": build_url("pola.png"),
+        "gain": build_url(f"gain.{ext}"),
+        "return_loss": build_url(f"return_loss.{ext}"),
+        "vswr": build_url(f"vswr.{ext}"),
+        "pola": build_url(f"pola.{ext}"),
     }
 
 
@@ -316,15 +532,16 @@ def txt_data_relpath(freq_ghz: float, source: str, kind: str) -> str | None:
     dir_parts = source_dirs.get(freq_ghz)
     if not dir_parts:
         return None
-    base_dir = STATIC_ROOT / "gambar cst file" / source
-    dir_path = base_dir.joinpath(*dir_parts)
-    if not dir_path.exists():
-        return None
-    keywords = TXT_KIND_KEYWORDS.get(kind, ())
-    for path in sorted(dir_path.rglob("*.txt")):
-        name = path.name.lower()
-        if any(key in name for key in keywords):
-            return path.relative_to(STATIC_ROOT).as_posix()
+    prefix = "/".join(["gambar cst file", source, *dir_parts])
+    relpaths = asset_store.list_paths(prefix)
+    if not relpaths:
+        dir_path = STATIC_ROOT / prefix
+        if not dir_path.exists():
+            return None
+        relpaths = [path.relative_to(STATIC_ROOT).as_posix() for path in sorted(dir_path.rglob("*"))]
+    for relpath in relpaths:
+        if trace_io.name_matches_kind(relpath.rsplit("/", 1)[-1], kind):
+            return relpath
     return None
 
 
@@ -335,7 +552,9 @@ def graph_data_urls_for(freq_ghz: float, source: str = "CST") -> dict:
         relpath = txt_data_relpath(freq_ghz, source, kind)
         if not relpath:
             return None
-        return url_for("static", filename=relpath)
+        if trace_io.trace_format(relpath) != "txt":
+            return url_for("local_txt", source=source, freq=freq_ghz, kind=kind)
+        return static_asset_url(relpath)
 
     return {
         "gain": build_url("gain"),
@@ -348,7 +567,12 @@ def graph_data_urls_for(freq_ghz: float, source: str = "CST") -> dict:
 def graph_meta_urls_for(freq_ghz: float, source: str = "CST") -> dict:
     def build_url(kind: str) -> str | None:
         if not USE_DRIVE_ASSETS:
-            return None
+            # Asset berbasis hash tidak bisa ditebak dari URL gambar di frontend.
+            name = f"{kind}.svg.meta.json" if GRAPH_RENDERER == "svg" else f"{kind}.meta.json"
+            relpath = graph_image_relpath(freq_ghz, source, name)
+            if not asset_store.blob_for(relpath):
+                return None
+            return static_asset_url(relpath)
         return url_for("drive_meta", source=source, freq=freq_ghz, kind=kind)
 
     return {
@@ -415,6 +639,16 @@ def get_default_form():
 maybe_sync_on_start()
 
 
+@app.before_request
+def check_shared_cache() -> None:
+    sync_cache_version()
+
+
+@app.errorhandler(admission.Rejected)
+def admission_rejected(exc: admission.Rejected):
+    return admission.unavailable(exc.retry_after)
+
+
 
 
 
@@ -426,9 +660,17 @@ def drive_img(rel_path: str):
     file_id = drive_img_file_id(rel_path)
     if not file_id:
         return "", 404
-    data = fetch_drive_file_bytes(file_id)
+    blob = asset_store.resolve(f"img/{_normalize_drive_path(rel_path)}")
+    if blob is not None:
+        return send_file(blob, max_age=86400)
+    with admission.slot(DRIVE_LIMITER):
+        data = fetch_drive_file_bytes(file_id)
+    headers = {"Cache-Control": "public, max-age=86400"}
     if data is None:
-        return "", 502
+        data = stale_drive_file(file_id)
+        if data is None:
+            return drive_unavailable()
+        headers = {"Cache-Control": "no-cache", "X-Cache": "stale"}
     ext = rel_path.lower().rsplit(".", 1)[-1] if "." in rel_path else ""
     if ext == "png":
         mime = "image/png"
@@ -436,9 +678,26 @@ def drive_img(rel_path: str):
         mime = "image/jpeg"
     else:
         mime = "application/octet-stream"
-    return Response(data, mimetype=mime, headers={"Cache-Control": "public, max-age=86400"})
+    return Response(data, mimetype=mime, headers=headers)
+
+@app.route("/a/<name>")
+def asset_blob(name: str):
+    digest, _, ext = name.partition(".")
+    blob = asset_store.load_manifest()["blobs"].get(digest)
+    if blob is None or blob["ext"] != ext:
+        return "", 404
+    path = asset_store.blob_path(digest, ext)
+    if not path.exists():
+        return "", 404
+    # Nama berbasis hash: isi tidak pernah berubah, aman di-cache selamanya.
+    resp = send_file(path, max_age=31536000)
+    resp.cache_control.immutable = True
+    resp.cache_control.public = True
+    return resp
+
 
 @app.route("/drive/txt/<source>/<freq>/<kind>")
+@admission.limited(DRIVE_LIMITER)
 def drive_txt(source: str, freq: str, kind: str):
     if not USE_DRIVE_ASSETS:
         return "", 404
@@ -447,83 +706,133 @@ def drive_txt(source: str, freq: str, kind: str):
     except ValueError:
         return "", 400
     kind_key = kind.lower()
-    file_id = drive_txt_file_id(freq_val, source, kind_key)
-    if not file_id:
-        return "", 404
-    data = fetch_drive_file_bytes(file_id)
-    if data is None:
-        return "", 502
-    return data, 200, {"Content-Type": "text/plain; charset=utf-8"}
-
-
-@app.route("/drive/meta/<source>/<freq>/<kind>")
-def drive_meta(source: str, freq: str, kind: str):
-    if not USE_DRIVE_ASSETS:
+    entry = drive_txt_file(freq_val, source, kind_key)
+    if not entry:
         return "", 404
+    path, file_id = entry
+    fmt = trace_io.trace_format(path)
+    blob = asset_store.resolve(f"gambar cst file/{path}")
+    if blob is not None and fmt == "txt":
+        return send_file(blob, mimetype="text/plain")
+    if fmt == "txt":
+        resp = open_drive_file(file_id)
+        if resp is None:
+            stale = stale_drive_file(file_id)
+            if stale is None:
+                return drive_unavailable()
+            return Response(stale, mimetype="text/plain", headers={"X-Cache": "stale"})
+        return Response(iter_stream_bytes(resp, stale_key=file_id), mimetype="text/plain")
+    lines = open_drive_txt_lines(path, file_id)
+    if lines is None:
+        return drive_unavailable()
+    return Response(trace_io.iter_trace_text(lines, fmt, kind_key), mimetype="text/plain")
+
+
+@app.route("/data/txt/<source>/<freq>/<kind>")
+def local_txt(source: str, freq: str, kind: str):
     try:
         freq_val = float(freq)
     except ValueError:
         return "", 400
     kind_key = kind.lower()
-    file_id = drive_txt_file_id(freq_val, source, kind_key)
-    if not file_id:
+    relpath = txt_data_relpath(freq_val, source, kind_key)
+    if not relpath:
         return "", 404
-    raw = fetch_drive_file_bytes(file_id)
-    if raw is None:
-        return "", 502
-    text_data = raw.decode("utf-8", errors="ignore")
-    lines = text_data.splitlines()
-    header = " ".join(lines[:3]).lower()
-    rows = []
-    for line in lines:
-        if not re.search(r"\d", line):
-            continue
-        nums = re.findall(r"[-+]?(?:\d*\.\d+|\d+)(?:[eE][-+]?\d+)?", line)
-        if len(nums) < 2:
-            continue
-        rows.append([float(n) for n in nums])
-    if not rows:
+    path = local_asset_path(relpath)
+    if path is None:
         return "", 404
+    body = trace_io.iter_trace_text(trace_io.open_lines(path), trace_io.trace_format(relpath), kind_key)
+    return Response(body, mimetype="text/plain")
 
-    is_angle = ("theta" in header) or ("angle" in header)
-    has_abs_gain = ("abs(gain)" in header) or ("abs(theta)" in header) or ("abs(phi)" in header)
-    x_idx = 0
-    y_idx = 2 if has_abs_gain and len(rows[0]) > 2 else 1
-    x_vals = []
-    y_vals = []
-    for row in rows:
-        if len(row) <= y_idx:
-            continue
-        x_vals.append(row[x_idx])
-        y_vals.append(row[y_idx])
-    if not x_vals:
-        return "", 404
 
-    # Labels are not used for meta, but keep plot consistent
-    if kind_key == "gain":
-        y_label = "Gain (dBi)"
-    elif kind_key == "vswr":
-        y_label = "VSWR"
-    elif kind_key == "return_loss":
-        y_label = "Return Loss (dB)"
-    elif kind_key == "pola":
-        y_label = "Pola (dB)"
-    else:
-        y_label = "Value"
-    x_label = "Angle (deg)" if is_angle else "Frequency (GHz)"
+def load_drive_trace(source: str, freq: str, kind: str, max_points: int = trace_io.MAX_POINTS):
+    if not USE_DRIVE_ASSETS:
+        return None, 404
+    try:
+        freq_val = float(freq)
+    except ValueError:
+        return None, 400
+    kind_key = kind.lower()
+    entry = drive_txt_file(freq_val, source, kind_key)
+    if not entry:
+        return None, 404
+    path, file_id = entry
+    lines = open_drive_txt_lines(path, file_id)
+    if lines is None:
+        return None, 502
+    try:
+        trace = trace_io.load_trace(lines, trace_io.trace_format(path), kind_key, max_points)
+    except Exception as exc:
+        print(f"[gdrive] gagal membaca file: {exc}")
+        return None, 502
+    if trace is None:
+        return None, 404
+    trace["title"] = f"{trace['y_label']} - {freq_val} GHz" if freq_val else None
+    return trace, 200
+
+
+def load_local_trace(source: str, freq: str, kind: str, max_points: int = trace_io.MAX_POINTS):
+    try:
+        freq_val = float(freq)
+    except ValueError:
+        return None, 400
+    kind_key = kind.lower()
+    relpath = txt_data_relpath(freq_val, source, kind_key)
+    if not relpath:
+        return None, 404
+    path = local_asset_path(relpath)
+    if path is None:
+        return None, 404
+    trace = trace_io.load_trace(trace_io.open_lines(path), trace_io.trace_format(relpath), kind_key, max_points)
+    if trace is None:
+        return None, 404
+    trace["title"] = f"{trace['y_label']} - {freq_val} GHz" if freq_val else None
+    return trace, 200
+
+
+def get_trace_pyramid(source: str, freq_val: float, kind: str):
+    key = (source.upper(), freq_val, kind)
+    cached = TRACE_PYRAMIDS.get(key)
+    if cached is not None:
+        return cached, 200
+    loader = load_drive_trace if USE_DRIVE_ASSETS else load_local_trace
+    status = 404
+
+    def build():
+        nonlocal status
+        trace, status = loader(source, str(freq_val), kind, PYRAMID_MAX_POINTS)
+        if trace is None:
+            return None
+        meta = {"x_label": trace["x_label"], "y_label": trace["y_label"]}
+        return meta, flatten_pyramid(build_pyramid(trace["x"], trace["y"]))
+
+    # Array piramida di-mmap dari shared_cache: satu salinan untuk semua worker.
+    cached = shared_cache.fill_arrays(f"pyramid:{int(USE_DRIVE_ASSETS)}:{key}", build)
+    if cached is None:
+        return None, status
+    meta, arrays = cached
+    entry = {
+        "pyramid": unflatten_pyramid(arrays),
+        "x_label": meta["x_label"],
+        "y_label": meta["y_label"],
+    }
+    TRACE_PYRAMIDS[key] = entry
+    return entry, 200
+
 
+def matplotlib_meta(trace: dict) -> dict:
     import matplotlib
     matplotlib.use("Agg")
     import matplotlib.pyplot as plt
     import matplotlib.transforms as mtrans
 
     fig, ax = plt.subplots(figsize=(6.2, 4.0), dpi=140)
-    ax.plot(x_vals, y_vals, color="#1f7a8c", linewidth=1.6)
+    ax.plot(trace["x"], trace["y"], color="#1f7a8c", linewidth=1.6)
     ax.grid(True, alpha=0.3, linestyle="--", linewidth=0.6)
-    ax.set_xlabel(x_label)
-    ax.set_ylabel(y_label)
-    if freq_val:
-        ax.set_title(f"{y_label} - {freq_val} GHz")
+    ax.set_xlabel(trace["x_label"])
+    ax.set_ylabel(trace["y_label"])
+    if trace["title"]:
+        ax.set_title(trace["title"])
     fig.tight_layout()
 
     fig.canvas.draw()
@@ -543,7 +852,7 @@ def drive_meta(source: str, freq: str, kind: str):
     ylim = ax.get_ylim()
     plt.close(fig)
 
-    meta = {
+    return {
         "pad": {
             "left": max(0.0, min(1.0, left)),
             "right": max(0.0, min(1.0, right)),
@@ -553,8 +862,337 @@ def drive_meta(source: str, freq: str, kind: str):
         "xlim": [float(xlim[0]), float(xlim[1])],
         "ylim": [float(ylim[0]), float(ylim[1])],
     }
+
+
+def trace_meta(trace: dict) -> dict:
+    if GRAPH_RENDERER == "svg":
+        _, meta = render_trace_svg(
+            trace["x"], trace["y"], trace["x_label"], trace["y_label"], trace["title"], GRAPH_POLAR
+        )
+        return meta
+    return matplotlib_meta(trace)
+
+
+def graph_meta_status(source: str, freq_val: float, kind: str) -> tuple[dict | None, int]:
+    key = (source.upper(), freq_val, kind)
+    if key in GRAPH_META_CACHE:
+        return GRAPH_META_CACHE[key], 200
+    status = 404
+    if USE_DRIVE_ASSETS:
+        def build():
+            nonlocal status
+            trace, status = load_drive_trace(source, str(freq_val), kind)
+            return trace_meta(trace) if trace else None
+
+        meta = shared_cache.fill_json(f"meta:{GRAPH_RENDERER}:{int(GRAPH_POLAR)}:{key}", build)
+    else:
+        name = f"{kind}.svg.meta.json" if GRAPH_RENDERER == "svg" else f"{kind}.meta.json"
+        try:
+            meta_path = local_asset_path(graph_image_relpath(freq_val, source, name))
+            meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path else None
+        except (ValueError, OSError):
+            meta = None
+    if meta is not None:
+        GRAPH_META_CACHE[key] = meta
+        return meta, 200
+    return None, status
+
+
+@app.route("/drive/meta/<source>/<freq>/<kind>")
+def drive_meta(source: str, freq: str, kind: str):
+    if not USE_DRIVE_ASSETS:
+        return "", 404
+    try:
+        freq_val = float(freq)
+    except ValueError:
+        return "", 400
+    meta, status = GRAPH_META_CACHE.get((source.upper(), freq_val, kind.lower())), 200
+    if meta is None:
+        with admission.slot(RENDER_LIMITER):
+            meta, status = graph_meta_status(source, freq_val, kind.lower())
+    if meta is None:
+        # 502 = gagal mengambil dari Drive (sementara), bukan "meta tidak ada".
+        return drive_unavailable() if status == 502 else ("", status)
     return jsonify(meta)
 
+
+@app.route("/drive/plot/<source>/<freq>/<kind>.svg")
+@admission.limited(RENDER_LIMITER)
+def drive_plot(source: str, freq: str, kind: str):
+    trace, status = load_drive_trace(source, freq, kind)
+    if trace is None:
+        return drive_unavailable() if status == 502 else ("", status)
+    svg, _ = render_trace_svg(trace["x"], trace["y"], trace["x_label"], trace["y_label"], trace["title"], GRAPH_POLAR)
+    return Response(svg, mimetype="image/svg+xml", headers={"Cache-Control": "public, max-age=86400"})
+
+@app.route("/api/trace/<source>/<freq>/<kind>")
+@admission.limited(DRIVE_LIMITER)
+def trace_range(source: str, freq: str, kind: str):
+    try:
+        freq_val = float(freq)
+        width = int(request.args.get("width", 800))
+    except (TypeError, ValueError):
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    if width <= 0:
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    entry, status = get_trace_pyramid(source, freq_val, kind.lower())
+    if entry is None:
+        return jsonify({"ok": False, "message": "Data grafik tidak tersedia."}), status
+
+    xs = entry["pyramid"]["x"]
+    try:
+        x0 = float(request.args.get("x0", xs[0]))
+        x1 = float(request.args.get("x1", xs[-1]))
+    except (TypeError, ValueError):
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    if math.isnan(x0) or math.isnan(x1):
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    if x1 < x0:
+        x0, x1 = x1, x0
+    # Jepit ke rentang data: +-inf tidak valid di JSON.
+    x0 = min(max(x0, xs[0]), xs[-1])
+    x1 = min(max(x1, xs[0]), xs[-1])
+    result = query_pyramid(entry["pyramid"], x0, x1, min(width, TRACE_MAX_WIDTH))
+    return jsonify({
+        "ok": True,
+        "x": result["x"],
+        "y": result["y"],
+        "level": result["level"],
+        "range": [x0, x1],
+        "bounds": [xs[0], xs[-1]],
+        "x_label": entry["x_label"],
+        "y_label": entry["y_label"],
+    })
+
+
+def build_bundle(freq_val: float) -> tuple[dict, bool]:
+    # Kembalikan (bundle, lengkap). lengkap=False jika ada data yang gagal
+    # diambil dari Drive (502); bundle seperti itu tidak boleh di-cache.
+    images = cst_image_urls(freq_val)
+    graphs = {}
+    complete = True
+    for source in ("CST", "AWR"):
+        img_urls = graph_image_urls(freq_val, source)
+        entries = {}
+        for kind in ("gain", "return_loss", "vswr", "pola"):
+            trace = None
+            meta = None
+            pyramid_entry, status = get_trace_pyramid(source, freq_val, kind)
+            complete = complete and status not in (502, 503)
+            if pyramid_entry is not None:
+                result = query_pyramid(pyramid_entry["pyramid"], float("-inf"), float("inf"), BUNDLE_TRACE_WIDTH)
+                trace = {
+                    "x": result["x"],
+                    "y": result["y"],
+                    "x_label": pyramid_entry["x_label"],
+                    "y_label": pyramid_entry["y_label"],
+                }
+            if img_urls.get(kind):
+                meta, status = graph_meta_status(source, freq_val, kind)
+                complete = complete and status not in (502, 503)
+            entries[kind] = {"img": img_urls.get(kind), "meta": meta, "trace": trace}
+        graphs[source] = entries
+    return {"ok": True, "freq": freq_val, "images": images, "graphs": graphs}, complete
+
+
+@app.route("/api/bundle/<freq>")
+def bundle(freq: str):
+    try:
+        freq_val = float(freq)
+    except ValueError:
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    if freq_val not in FREQ_OPTIONS_GHZ:
+        return jsonify({"ok": False, "message": "Frekuensi tidak tersedia."}), 404
+
+    cached = BUNDLE_CACHE.get(freq_val)
+    if cached is None:
+        with admission.slot(RENDER_LIMITER):
+            data, complete = build_bundle(freq_val)
+        if not complete:
+            return drive_unavailable()
+        body = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        cached = {
+            "body": body,
+            "gzip": gzip.compress(body, compresslevel=6),
+            "etag": hashlib.sha1(body).hexdigest(),
+        }
+        BUNDLE_CACHE[freq_val] = cached
+
+    use_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+    etag = cached["etag"] + ("-gz" if use_gzip else "")
+    resp = Response(cached["gzip"] if use_gzip else cached["body"], mimetype="application/json")
+    if use_gzip:
+        resp.headers["Content-Encoding"] = "gzip"
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = "public, max-age=300"
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
+
+
+def build_response_models(progress=None) -> dict[tuple[str, str], dict]:
+    loader = load_drive_trace if USE_DRIVE_ASSETS else load_local_trace
+    models = {}
+    total = 2 * len(response_model.MODEL_KINDS) * len(FREQ_OPTIONS_GHZ)
+    done = 0
+    for source in ("CST", "AWR"):
+        for kind in response_model.MODEL_KINDS:
+            freqs, traces = [], []
+            for freq in FREQ_OPTIONS_GHZ:
+                trace, _ = loader(source, str(freq), kind)
+                done += 1
+                if progress:
+                    progress(done, total, f"{source}/{freq}/{kind}")
+                if trace is not None:
+                    freqs.append(freq)
+                    traces.append(trace)
+            if not traces:
+                continue
+            normalize = traces[0]["x_label"].startswith("Frequency")
+            model = response_model.build_table(freqs, traces, normalize)
+            if model is not None:
+                models[(source, kind)] = model
+    return models
+
+
+def run_model_build(progress=None) -> dict:
+    global RESPONSE_MODELS
+    models = build_response_models(progress)
+    try:
+        response_model.save_models(RESPONSE_MODEL_PATH, models)
+    except OSError as exc:
+        print(f"[model] gagal menyimpan model: {exc}")
+    RESPONSE_MODELS = models
+    return {"models": len(models)}
+
+
+JOBS.register("model", run_model_build)
+
+
+def get_response_models() -> dict[tuple[str, str], dict] | None:
+    # Tanpa npz yang masih segar, model dibangun sebagai job latar (hingga 30
+    # trace dari Drive), bukan di dalam request; sementara itu None.
+    global RESPONSE_MODELS
+    if RESPONSE_MODELS is None:
+        try:
+            if RESPONSE_MODEL_PATH.stat().st_mtime >= RESPONSE_MODEL_MIN_MTIME:
+                RESPONSE_MODELS = response_model.load_models(RESPONSE_MODEL_PATH)
+        except (OSError, ValueError):
+            pass
+    if RESPONSE_MODELS is None:
+        JOBS.submit("model")
+    return RESPONSE_MODELS
+
+
+def model_freq_range() -> tuple[float, float]:
+    return min(FREQ_OPTIONS_GHZ), max(FREQ_OPTIONS_GHZ)
+
+
+def nearest_freq(freq_ghz: float) -> float:
+    return min(FREQ_OPTIONS_GHZ, key=lambda f: abs(f - freq_ghz))
+
+
+@app.route("/api/model/<source>/<kind>")
+def model_curve(source: str, kind: str):
+    try:
+        freq_val = float(request.args.get("freq", ""))
+    except ValueError:
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    if not math.isfinite(freq_val):
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    models = get_response_models()
+    if models is None:
+        return admission.unavailable(RESPONSE_MODEL_RETRY_S, "Model sedang dibangun, coba lagi.")
+    model = models.get((source.upper(), kind.lower()))
+    if model is None:
+        return jsonify({"ok": False, "message": "Model tidak tersedia."}), 404
+    try:
+        result = response_model.evaluate(model, freq_val)
+    except ValueError as exc:
+        return jsonify({"ok": False, "message": str(exc)}), 400
+
+    rmse = float(result["nearest_rmse"][0])
+    return jsonify({
+        "ok": True,
+        "freq": freq_val,
+        "x": result["x"][0].tolist(),
+        "y": result["y"][0].tolist(),
+        "x_label": model["x_label"],
+        "y_label": model["y_label"],
+        "bracket": result["bracket"][0].tolist(),
+        "nearest": {
+            "freq": float(result["nearest_freq"][0]),
+            "distance_ghz": round(float(result["nearest_distance"][0]), 6),
+            # Galat leave-one-out dataset terdekat; null untuk dataset di ujung rentang.
+            "loo_rmse": None if rmse != rmse else rmse,
+        },
+    })
+
+
+@app.route("/api/admission")
+def admission_stats():
+    return jsonify({
+        "ok": True,
+        "limiters": {lim.name: lim.stats() for lim in (DRIVE_LIMITER, RENDER_LIMITER)},
+        "breakers": {DRIVE_BREAKER.name: DRIVE_BREAKER.stats()},
+        "stale_cache": DRIVE_STALE.stats(),
+    })
+
+
+def request_data():
+    # Form atau JSON objek; JSON selain objek (array, angka) dianggap tidak valid.
+    if request.is_json:
+        data = request.get_json(silent=True)
+        return data if isinstance(data, dict) else None
+    return request.form
+
+
+def jobs_denied():
+    # Tanpa JOBS_TOKEN endpoint job disembunyikan: deploy publik tidak boleh
+    # memicu unduhan Drive atau subprocess generate_graphs.py.
+    if not JOBS_TOKEN:
+        return jsonify({"ok": False, "message": "Tidak ditemukan."}), 404
+    if not hmac.compare_digest(request.headers.get("X-Jobs-Token", ""), JOBS_TOKEN):
+        return jsonify({"ok": False, "message": "Tidak diizinkan."}), 403
+    return None
+
+
+@app.route("/api/jobs", methods=["GET", "POST"])
+def jobs_api():
+    denied = jobs_denied()
+    if denied:
+        return denied
+    if request.method == "GET":
+        return jsonify({"ok": True, "jobs": JOBS.list()})
+
+    data = request_data()
+    if data is None or not isinstance(data.get("kind", ""), str):
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    kind = data.get("kind", "")
+    params = {}
+    if kind == "sync":
+        target = data.get("target", "txt")
+        if target not in ("txt", "img"):
+            return jsonify({"ok": False, "message": "Target sync tidak dikenal."}), 400
+        params["target"] = target
+    try:
+        job, created = JOBS.submit(kind, params)
+    except ValueError as exc:
+        return jsonify({"ok": False, "message": str(exc)}), 400
+    # 202 untuk job baru, 200 jika job yang sama masih berjalan.
+    return jsonify({"ok": True, "created": created, "job": job}), 202 if created else 200
+
+
+@app.route("/api/jobs/<job_id>")
+def job_status(job_id: str):
+    denied = jobs_denied()
+    if denied:
+        return denied
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"ok": False, "message": "Job tidak ditemukan."}), 404
+    return jsonify({"ok": True, "job": job})
+
+
 @app.route("/", methods=["GET", "POST"])
 def landing():
     if request.method == "POST":
@@ -643,22 +1281,75 @@ def calculator_api():
     except (TypeError, ValueError):
         return jsonify({"ok": False, "message": "Input tidak valid."}), 400
 
-    if freq not in FREQ_OPTIONS_GHZ:
+    f_min, f_max = model_freq_range()
+    if not f_min <= freq <= f_max:
         return jsonify({"ok": False, "message": "Frekuensi tidak tersedia."}), 400
 
     try:
         hasil = calc(freq, er, h, wf)
     except ValueError as exc:
         return jsonify({"ok": False, "message": str(exc)}), 400
-    imgs = cst_image_urls(freq)
+    # Di luar dataset simulasi: gambar memakai dataset terdekat, kurva dari /api/model.
+    img_freq = freq if freq in FREQ_OPTIONS_GHZ else nearest_freq(freq)
+    imgs = cst_image_urls(img_freq)
     return jsonify({
         "ok": True,
         "hasil": hasil,
         "imgs": imgs,
         "img_c": imgs["antena"],
         "img_d": imgs["pola"],
+        "estimated": freq not in FREQ_OPTIONS_GHZ,
+        "nearest_freq": img_freq,
     })
 
+def _optional_float(data, key: str) -> float | None:
+    value = data.get(key)
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _optional_range(data, key: str) -> tuple[float, float] | None:
+    lo = _optional_float(data, f"{key}_min")
+    hi = _optional_float(data, f"{key}_max")
+    if lo is None and hi is None:
+        return None
+    return (lo if lo is not None else float("-inf"), hi if hi is not None else float("inf"))
+
+
+@app.route("/api/inverse", methods=["POST"])
+def inverse_api():
+    # Terima form (seperti /api/calculator) atau JSON (untuk katalog substrat sendiri).
+    data = request_data()
+    if data is None:
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    catalog = data.get("catalog") if request.is_json else None
+    try:
+        if catalog is not None:
+            catalog = [
+                {"name": str(sub["name"]), "er": float(sub["er"]), "h": [float(h) for h in sub["h"]]}
+                for sub in catalog
+            ]
+        results = inverse_design.solve(
+            a_mm=_optional_float(data, "a"),
+            lf_mm=_optional_float(data, "lf"),
+            freq_ghz=_optional_float(data, "freq"),
+            wf_mm=_optional_float(data, "wf"),
+            catalog=catalog,
+            er_range=_optional_range(data, "er"),
+            h_range=_optional_range(data, "h"),
+            wf_range=_optional_range(data, "wf") or inverse_design.WF_RANGE,
+            freq_range=_optional_range(data, "freq") or inverse_design.FREQ_RANGE,
+            limit=int(data.get("limit", inverse_design.MAX_RESULTS)),
+        )
+    except inverse_design.InvalidInput as exc:
+        return jsonify({"ok": False, "message": str(exc)}), 400
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"ok": False, "message": "Input tidak valid."}), 400
+    if not results:
+        return jsonify({"ok": False, "message": "Tidak ada solusi yang memenuhi batasan.", "solutions": []}), 200
+    return jsonify({"ok": True, "solutions": results})
+
 if __name__ == "__main__":
     app.run(debug=True)
 
@@ -0,0 +1,150 @@
+﻿import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent
+STORE_ROOT = Path(os.getenv("ASSET_STORE_DIR", str(ROOT / "store")))
+MANIFEST_NAME = "manifest.json"
+SKIP_DIRS = {"css"}
+# Input scripts/generate_graphs.py: tetap disalin ke store tapi tidak pernah di-prune,
+# supaya rebuild grafik berikutnya masih punya file sumber.
+KEEP_DIRS = {"gambar cst file"}
+
+_MANIFEST: dict | None = None
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def blob_path(digest: str, ext: str, store_root: Path = STORE_ROOT) -> Path:
+    name = f"{digest}.{ext}" if ext else digest
+    return store_root / "blobs" / digest[:2] / name
+
+
+def _ext(path: Path) -> str:
+    return path.suffix.lower().lstrip(".")
+
+
+def build_store(
+    static_root: Path,
+    store_root: Path = STORE_ROOT,
+    prune: bool = False,
+    keep_existing: bool = False,
+) -> dict:
+    files: dict[str, str] = {}
+    blobs: dict[str, dict] = {}
+    if keep_existing:
+        # Pertahankan entri lama (mis. file yang sudah di-prune dari static/);
+        # file yang ada di static/ menimpa entri dengan path yang sama.
+        old = _read_manifest(store_root)
+        if old is None:
+            raise RuntimeError("Manifest lama tidak bisa dibaca; batal agar entri lama tidak hilang.")
+        for rel, digest in old["files"].items():
+            blob = old["blobs"].get(digest)
+            if blob and blob_path(digest, blob["ext"], store_root).exists():
+                files[rel] = digest
+                blobs[digest] = blob
+    total_bytes = 0
+    for path in sorted(static_root.rglob("*")):
+        if not path.is_file() or path.name.startswith("."):
+            continue
+        rel = path.relative_to(static_root)
+        if rel.parts[0] in SKIP_DIRS:
+            continue
+        digest = file_digest(path)
+        size = path.stat().st_size
+        total_bytes += size
+        files[rel.as_posix()] = digest
+        if digest not in blobs:
+            # Blob memakai ekstensi file pertama agar mimetype tetap bisa ditebak.
+            blobs[digest] = {"size": size, "ext": _ext(path)}
+            target = blob_path(digest, blobs[digest]["ext"], store_root)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(path, target)
+        if prune and rel.parts[0] not in KEEP_DIRS:
+            path.unlink()
+
+    # Blob lama yang tidak lagi dirujuk (file-nya berubah) dikeluarkan dari manifest.
+    referenced = set(files.values())
+    blobs = {digest: blob for digest, blob in blobs.items() if digest in referenced}
+    manifest = {"version": 1, "files": files, "blobs": blobs}
+    store_root.mkdir(parents=True, exist_ok=True)
+    # Tulis ke file sementara lalu ganti: worker yang sedang membaca tidak pernah
+    # melihat manifest setengah jadi.
+    tmp = store_root / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, store_root / MANIFEST_NAME)
+    return {
+        "files": len(files),
+        "blobs": len(blobs),
+        "bytes": total_bytes,
+        "stored_bytes": sum(blob["size"] for blob in blobs.values()),
+    }
+
+
+def store_exists(store_root: Path = STORE_ROOT) -> bool:
+    return (store_root / MANIFEST_NAME).exists()
+
+
+def _empty_manifest() -> dict:
+    return {"version": 1, "files": {}, "blobs": {}}
+
+
+def _read_manifest(store_root: Path) -> dict | None:
+    # None = manifest ada tapi gagal dibaca; store yang belum dibuat = manifest kosong.
+    try:
+        return json.loads((store_root / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return _empty_manifest()
+    except (OSError, ValueError) as exc:
+        print(f"[store] gagal membaca manifest: {exc}")
+        return None
+
+
+def load_manifest(store_root: Path = STORE_ROOT) -> dict:
+    global _MANIFEST
+    if _MANIFEST is None:
+        manifest = _read_manifest(store_root)
+        if manifest is None:
+            # Jangan di-cache: request berikutnya mencoba membaca ulang.
+            return _empty_manifest()
+        _MANIFEST = manifest
+    return _MANIFEST
+
+
+def reset_manifest() -> None:
+    global _MANIFEST
+    _MANIFEST = None
+
+
+def digest_for(relpath: str) -> str | None:
+    return load_manifest()["files"].get(relpath)
+
+
+def blob_for(relpath: str) -> tuple[str, str] | None:
+    digest = digest_for(relpath)
+    if not digest:
+        return None
+    return digest, load_manifest()["blobs"][digest]["ext"]
+
+
+def resolve(relpath: str) -> Path | None:
+    entry = blob_for(relpath)
+    if not entry:
+        return None
+    path = blob_path(*entry)
+    return path if path.exists() else None
+
+
+def list_paths(prefix: str) -> list[str]:
+    prefix = prefix.rstrip("/") + "/"
+    return sorted(path for path in load_manifest()["files"] if path.startswith(prefix))
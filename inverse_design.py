@@ -0,0 +1,170 @@
+﻿import math
+
+import numpy as np
+
+
+C0 = 3e8  # m/s, sama dengan app.C0
+
+# Substrat yang tersedia di lab: er nominal + ketebalan stok (mm).
+SUBSTRATES = [
+    {"name": "FR-4", "er": 4.4, "h": [0.8, 1.0, 1.2, 1.6, 2.0]},
+    {"name": "Rogers RO4003C", "er": 3.38, "h": [0.203, 0.305, 0.508, 0.813, 1.524]},
+    {"name": "Rogers RO4350B", "er": 3.48, "h": [0.254, 0.508, 0.762, 1.524]},
+    {"name": "Rogers RT/duroid 5880", "er": 2.2, "h": [0.254, 0.508, 0.787, 1.575]},
+    {"name": "Rogers RO3010", "er": 10.2, "h": [0.635, 1.28]},
+    {"name": "Taconic TLY-5", "er": 2.2, "h": [0.508, 0.787, 1.575]},
+]
+DEFAULT_WF = 3.0
+WF_RANGE = (0.2, 10.0)
+FREQ_RANGE = (0.5, 10.0)
+MAX_RESULTS = 10
+
+
+class InvalidInput(ValueError):
+    # Kesalahan input yang pesannya aman ditampilkan ke pengguna.
+    pass
+
+
+def forward(f_ghz, er, h_mm, wf_mm) -> dict:
+    # Versi array dari app.calc(): semua argumen boleh berupa array (broadcast).
+    f_hz = np.asarray(f_ghz, dtype=float) * 1e9
+    er = np.asarray(er, dtype=float)
+    h_m = np.asarray(h_mm, dtype=float) / 1000.0
+    w_m = np.asarray(wf_mm, dtype=float) / 1000.0
+    eps_eff = (er + 1) / 2 + (er - 1) / 2 / np.sqrt(1 + 12 * h_m / w_m)
+    a_m = (2 * C0) / (3 * f_hz * np.sqrt(er))
+    return {
+        "lf_mm": C0 / (f_hz * np.sqrt(eps_eff)) / 2 * 1000,
+        "a_mm": a_m * 1000,
+        "wg_mm": (a_m + 6 * h_m) * 1000,
+        "lg_mm": (a_m + 6 * h_m) * 1000,
+        "ht_mm": (3 ** 0.5) / 2 * a_m * 1000,
+    }
+
+
+def freq_for_side(a_mm, er):
+    # a = 2c / (3 f sqrt(er))  ->  f = 2c / (3 a sqrt(er))
+    return (2 * C0) / (3 * (np.asarray(a_mm) / 1000.0) * np.sqrt(er)) / 1e9
+
+
+def freq_for_feed(lf_mm, er, h_mm, wf_mm):
+    # lf = c / (2 f sqrt(eff)), eff tidak bergantung pada f.
+    eps_eff = (er + 1) / 2 + (er - 1) / 2 / np.sqrt(1 + 12 * np.asarray(h_mm) / np.asarray(wf_mm))
+    return C0 / (2 * (np.asarray(lf_mm) / 1000.0) * np.sqrt(eps_eff)) / 1e9
+
+
+def wf_for_feed(lf_mm, f_ghz, er, h_mm):
+    # Balik rumus eff: 1/sqrt(1 + 12h/Wf) = s  ->  Wf = 12h / (1/s^2 - 1).
+    # Hanya ada solusi jika (er+1)/2 < eff_target < er; selain itu NaN.
+    eps_target = (C0 / (2 * np.asarray(f_ghz) * 1e9 * np.asarray(lf_mm) / 1000.0)) ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = (eps_target - (er + 1) / 2) * 2 / (er - 1)
+        wf = 12 * np.asarray(h_mm) / (1 / s ** 2 - 1)
+    return np.where((s > 0) & (s < 1), wf, np.nan)
+
+
+def candidates(catalog: list[dict] | None = None) -> dict:
+    names, ers, hs = [], [], []
+    for sub in catalog or SUBSTRATES:
+        er = float(sub["er"])
+        if not math.isfinite(er) or er < 1:
+            raise InvalidInput(f"er substrat {sub['name']} harus >= 1.")
+        for h in sub["h"]:
+            h = float(h)
+            if not math.isfinite(h) or h <= 0:
+                raise InvalidInput(f"Ketebalan substrat {sub['name']} harus lebih besar dari 0.")
+            names.append(sub["name"])
+            ers.append(er)
+            hs.append(h)
+    return {"name": np.array(names, dtype=object), "er": np.array(ers), "h": np.array(hs)}
+
+
+def solve(
+    a_mm: float | None = None,
+    lf_mm: float | None = None,
+    freq_ghz: float | None = None,
+    wf_mm: float | None = None,
+    catalog: list[dict] | None = None,
+    er_range: tuple[float, float] | None = None,
+    h_range: tuple[float, float] | None = None,
+    wf_range: tuple[float, float] = WF_RANGE,
+    freq_range: tuple[float, float] = FREQ_RANGE,
+    limit: int = MAX_RESULTS,
+) -> list[dict]:
+    # Semua kandidat (substrat x ketebalan) diselesaikan sekaligus dengan rumus
+    # balik tertutup, lalu disaring dengan batasan dan diurutkan menurut galat.
+    if a_mm is None and lf_mm is None:
+        raise InvalidInput("Target a atau lf wajib diisi.")
+    if any(val is not None and not math.isfinite(val) for val in (a_mm, lf_mm, freq_ghz, wf_mm)):
+        raise InvalidInput("Input tidak valid.")
+    if any(val is not None and val <= 0 for val in (a_mm, lf_mm, freq_ghz)):
+        raise InvalidInput("Target harus lebih besar dari 0.")
+    if wf_mm is not None and wf_mm <= 0:
+        raise InvalidInput("Wf harus lebih besar dari 0.")
+    if limit < 1:
+        raise InvalidInput("Jumlah hasil (limit) minimal 1.")
+
+    cand = candidates(catalog)
+    er, h = cand["er"], cand["h"]
+    n = len(er)
+    if n == 0:
+        raise InvalidInput("Katalog substrat kosong.")
+
+    # Frekuensi: tetap jika diberikan, jika tidak diturunkan dari a (atau lf).
+    if freq_ghz is not None:
+        f = np.full(n, float(freq_ghz))
+    elif a_mm is not None:
+        f = freq_for_side(a_mm, er)
+    else:
+        f = freq_for_feed(lf_mm, er, h, wf_mm or DEFAULT_WF)
+
+    # Wf: dikunci pengguna, atau diselesaikan dari lf jika frekuensi sudah
+    # tertentu oleh target lain. Jika dikunci, galat lf dihitung di bawah.
+    if wf_mm is not None:
+        wf = np.full(n, float(wf_mm))
+    elif lf_mm is not None and (freq_ghz is not None or a_mm is not None):
+        wf = wf_for_feed(lf_mm, f, er, h)
+    else:
+        wf = np.full(n, DEFAULT_WF)
+
+    ok = ~np.isnan(wf) & (wf >= wf_range[0]) & (wf <= wf_range[1])
+    ok &= (f >= freq_range[0]) & (f <= freq_range[1])
+    if er_range:
+        ok &= (er >= er_range[0]) & (er <= er_range[1])
+    if h_range:
+        ok &= (h >= h_range[0]) & (h <= h_range[1])
+    if not ok.any():
+        return []
+
+    dims = forward(f[ok], er[ok], h[ok], wf[ok])
+    error = np.zeros(int(ok.sum()))
+    if a_mm is not None:
+        error += np.abs(dims["a_mm"] - a_mm) / a_mm
+    if lf_mm is not None:
+        error += np.abs(dims["lf_mm"] - lf_mm) / lf_mm
+
+    # Buang kandidat dengan hasil non-finite (NaN/inf tidak valid di JSON).
+    finite = np.isfinite(error)
+    for val in dims.values():
+        finite &= np.isfinite(val)
+    if not finite.any():
+        return []
+    ok[ok] = finite
+    dims = {key: val[finite] for key, val in dims.items()}
+    error = error[finite]
+    # Galat sama: utamakan Wf yang paling dekat dengan desain acuan (DEFAULT_WF).
+    order = np.lexsort((np.abs(wf[ok] - DEFAULT_WF), np.round(error, 9)))[:limit]
+
+    names = cand["name"][ok]
+    results = []
+    for idx in order:
+        results.append({
+            "substrat": names[idx],
+            "er": float(er[ok][idx]),
+            "h": float(h[ok][idx]),
+            "wf": float(wf[ok][idx]),
+            "freq": float(f[ok][idx]),
+            "error": float(error[idx]),
+            **{key: float(val[idx]) for key, val in dims.items()},
+        })
+    return results
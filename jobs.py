@@ -0,0 +1,177 @@
+﻿import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: status tidak dibagi antar proses.
+    fcntl = None
+
+
+ACTIVE_STATES = ("queued", "running")
+MAX_FINISHED_JOBS = 50
+MAX_FILE_LOG = 500
+
+
+def _owner_alive(owner: str, own: str) -> bool:
+    # owner = "<pid>:<token>"; token beda per JobRunner, jadi pid yang dipakai
+    # ulang setelah restart (mis. pid 1 di container) tidak dianggap hidup.
+    pid, _, _ = owner.partition(":")
+    if owner == own:
+        return True
+    if not pid.isdigit() or int(pid) == os.getpid() or os.name != "posix":
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobRunner:
+    # Antrian job di dalam proses: worker pool + status yang disimpan ke JSON.
+    # Beberapa worker (gunicorn dsb.) berbagi file status yang sama di bawah
+    # flock, jadi dedup dan /api/jobs berlaku lintas proses.
+    def __init__(self, state_path: Path, max_workers: int = 2):
+        self.state_path = state_path
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.handlers: dict[str, Callable] = {}
+        self.jobs: dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def register(self, kind: str, handler: Callable) -> None:
+        self.handlers[kind] = handler
+
+    def submit(self, kind: str, params: dict | None = None) -> tuple[dict, bool]:
+        if kind not in self.handlers:
+            raise ValueError("Jenis job tidak dikenal.")
+        params = params or {}
+        key = f"{kind}:{json.dumps(params, sort_keys=True)}"
+        with self.lock, self._file_lock():
+            # Job yang sama masih antre/berjalan (di proses mana pun): kembalikan job itu.
+            for job in self._merged().values():
+                if job["key"] == key and job["status"] in ACTIVE_STATES:
+                    return job, False
+            job = {
+                "id": uuid.uuid4().hex[:12],
+                "kind": kind,
+                "key": key,
+                "params": params,
+                "owner": self.owner,
+                "status": "queued",
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                "progress": {"done": 0, "total": None, "current": None},
+                "files": [],
+                "result": None,
+                "error": None,
+            }
+            self.jobs[job["id"]] = job
+            self._save_unlocked()
+        self.pool.submit(self._run, job["id"])
+        return json.loads(json.dumps(job)), True
+
+    def get(self, job_id: str) -> dict | None:
+        with self.lock, self._file_lock():
+            return self._merged().get(job_id)
+
+    def list(self) -> list[dict]:
+        with self.lock, self._file_lock():
+            jobs = sorted(self._merged().values(), key=lambda job: job["created"], reverse=True)
+        return [{key: val for key, val in job.items() if key != "files"} for job in jobs]
+
+    def _run(self, job_id: str) -> None:
+        with self.lock:
+            job = self.jobs[job_id]
+            job["status"] = "running"
+            job["started"] = time.time()
+            self._save_locked()
+
+        def progress(done: int, total: int | None = None, current: str | None = None) -> None:
+            with self.lock:
+                job["progress"] = {"done": done, "total": total, "current": current}
+                if current and len(job["files"]) < MAX_FILE_LOG:
+                    job["files"].append(current)
+                self._save_locked()
+
+        try:
+            result = self.handlers[job["kind"]](progress=progress, **job["params"])
+        except Exception as exc:
+            traceback.print_exc()
+            status, result, error = "failed", None, str(exc) or exc.__class__.__name__
+        else:
+            status, error = "done", None
+        with self.lock:
+            job["status"] = status
+            job["result"] = result
+            job["error"] = error
+            job["finished"] = time.time()
+            self._save_locked()
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            fh = open(self.state_path.with_suffix(".lock"), "a+b")
+        except OSError:
+            # Folder read-only: status hanya di memori proses ini.
+            yield
+            return
+        with fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _read_file(self) -> dict[str, dict]:
+        try:
+            jobs = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {job["id"]: job for job in jobs if isinstance(job, dict) and "id" in job}
+
+    def _merged(self) -> dict[str, dict]:
+        jobs = self._read_file()
+        for job in jobs.values():
+            # Job milik proses yang sudah berhenti tidak akan selesai lagi.
+            if job.get("status") in ACTIVE_STATES and not _owner_alive(job.get("owner", ""), self.owner):
+                job["status"] = "failed"
+                job["error"] = "Dihentikan karena server restart."
+        jobs.update(json.loads(json.dumps(self.jobs)))
+        return jobs
+
+    def _save_locked(self) -> None:
+        with self._file_lock():
+            self._save_unlocked()
+
+    def _save_unlocked(self) -> None:
+        jobs = self._merged()
+        finished = sorted(
+            (job for job in jobs.values() if job["status"] not in ACTIVE_STATES),
+            key=lambda job: job["created"],
+        )
+        for job in finished[:-MAX_FINISHED_JOBS]:
+            del jobs[job["id"]]
+            self.jobs.pop(job["id"], None)
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(list(jobs.values())), encoding="utf-8")
+            os.replace(tmp, self.state_path)
+        except OSError as exc:
+            print(f"[jobs] gagal menyimpan status: {exc}")
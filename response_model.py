@@ -0,0 +1,120 @@
+﻿import os
+from pathlib import Path
+
+import numpy as np
+
+
+GRID_SIZE = 256
+MODEL_KINDS = ("return_loss", "vswr", "gain")
+
+
+def _longest_run(x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Ambil potongan x naik-ketat terpanjang: buang potongan phi berikutnya
+    # pada file gain CST. Baris judul kolom sudah dibuang oleh trace_io, jadi
+    # grid hanya mencakup rentang yang benar-benar ada datanya.
+    if len(x) < 2:
+        return x, y
+    breaks = np.flatnonzero(np.diff(x) <= 0) + 1
+    bounds = np.concatenate(([0], breaks, [len(x)]))
+    best = int(np.argmax(np.diff(bounds)))
+    start, stop = bounds[best], bounds[best + 1]
+    return x[start:stop], y[start:stop]
+
+
+def build_table(freqs: list[float], traces: list[dict], normalize: bool, grid_size: int = GRID_SIZE) -> dict | None:
+    runs = []
+    for freq, trace in zip(freqs, traces):
+        x, y = _longest_run(np.asarray(trace["x"], dtype=float), np.asarray(trace["y"], dtype=float))
+        if len(x) < 2:
+            continue
+        runs.append((freq, x / freq if normalize else x, y))
+    if len(runs) < 2:
+        return None
+    runs.sort(key=lambda run: run[0])
+    lo = max(run[1][0] for run in runs)
+    hi = min(run[1][-1] for run in runs)
+    if hi <= lo:
+        return None
+
+    grid = np.linspace(lo, hi, grid_size)
+    table = np.vstack([np.interp(grid, u, y) for _, u, y in runs]).astype(np.float32)
+    model_freqs = np.array([run[0] for run in runs])
+    return {
+        "freqs": model_freqs,
+        "grid": grid,
+        "table": table,
+        "normalize": normalize,
+        "loo_rmse": _leave_one_out(model_freqs, table),
+        "x_label": traces[0]["x_label"],
+        "y_label": traces[0]["y_label"],
+    }
+
+
+def _leave_one_out(freqs: np.ndarray, table: np.ndarray) -> np.ndarray:
+    # Galat tiap dataset jika ia diprediksi dari dua tetangganya; NaN di ujung.
+    rmse = np.full(len(freqs), np.nan)
+    if len(freqs) < 3:
+        return rmse
+    w = (freqs[1:-1] - freqs[:-2]) / (freqs[2:] - freqs[:-2])
+    predicted = (1 - w)[:, None] * table[:-2] + w[:, None] * table[2:]
+    rmse[1:-1] = np.sqrt(np.mean((predicted - table[1:-1]) ** 2, axis=1))
+    return rmse
+
+
+def evaluate(model: dict, freq_ghz) -> dict:
+    freqs = model["freqs"]
+    f = np.atleast_1d(np.asarray(freq_ghz, dtype=float))
+    if not np.all(np.isfinite(f)):
+        raise ValueError("Frekuensi tidak valid.")
+    if np.any(f < freqs[0]) or np.any(f > freqs[-1]):
+        raise ValueError("Frekuensi di luar rentang model.")
+    hi = np.clip(np.searchsorted(freqs, f, side="right"), 1, len(freqs) - 1)
+    lo = hi - 1
+    w = (f - freqs[lo]) / (freqs[hi] - freqs[lo])
+    table = model["table"]
+    y = (1 - w)[:, None] * table[lo] + w[:, None] * table[hi]
+    x = np.outer(f, model["grid"]) if model["normalize"] else np.broadcast_to(model["grid"], y.shape)
+
+    nearest = np.abs(freqs[None, :] - f[:, None]).argmin(axis=1)
+    return {
+        "x": x,
+        "y": y,
+        "bracket": np.stack([freqs[lo], freqs[hi]], axis=1),
+        "nearest_freq": freqs[nearest],
+        "nearest_distance": np.abs(freqs[nearest] - f),
+        "nearest_rmse": model["loo_rmse"][nearest],
+    }
+
+
+def save_models(path, models: dict) -> None:
+    arrays = {}
+    for (source, kind), model in models.items():
+        prefix = f"{source}__{kind}__"
+        for key in ("freqs", "grid", "table", "loo_rmse"):
+            arrays[prefix + key] = model[key]
+        arrays[prefix + "meta"] = np.array([int(model["normalize"]), model["x_label"], model["y_label"]])
+    # Tulis ke file sementara lalu ganti, supaya worker lain tidak membaca npz setengah jadi.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez_compressed(tmp, **arrays)
+    os.replace(tmp, path)
+
+
+def load_models(path) -> dict:
+    models = {}
+    with np.load(path) as data:
+        keys = {name.rsplit("__", 1)[0] for name in data.files}
+        for prefix in keys:
+            source, kind = prefix.split("__")
+            normalize, x_label, y_label = data[f"{prefix}__meta"].tolist()
+            models[(source, kind)] = {
+                "freqs": data[f"{prefix}__freqs"],
+                "grid": data[f"{prefix}__grid"],
+                "table": data[f"{prefix}__table"],
+                "loo_rmse": data[f"{prefix}__loo_rmse"],
+                "normalize": bool(int(normalize)),
+                "x_label": x_label,
+                "y_label": y_label,
+            }
+    return models
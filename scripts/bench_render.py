@@ -0,0 +1,72 @@
+﻿import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_graphs import INPUT_ROOT, extract_freq, load_trace, plot_file_matplotlib, plot_file_svg  # noqa: E402
+import trace_io  # noqa: E402
+
+
+def bench(files: list[Path], render, out_dir: Path, repeat: int) -> tuple[list[float], int]:
+    timings: list[float] = []
+    total_size = 0
+    for file_path in files:
+        freq = extract_freq(file_path)
+        for kind in trace_io.file_kinds(file_path.name) or [None]:
+            trace = load_trace(file_path, kind)
+            if trace is None:
+                continue
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                out_path = render(file_path, out_dir, freq, trace, kind=kind)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings.append(best)
+            total_size += out_path.stat().st_size
+    return timings, total_size
+
+
+def report(name: str, timings: list[float], total_size: int) -> None:
+    if not timings:
+        print(f"{name:<11} tidak ada data")
+        return
+    print(
+        f"{name:<11} n={len(timings):<3} "
+        f"median={statistics.median(timings) * 1000:8.2f} ms  "
+        f"total={sum(timings) * 1000:9.2f} ms  "
+        f"size={total_size / 1024:8.1f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bandingkan waktu render dan ukuran output matplotlib vs svg.")
+    parser.add_argument("--input", default=str(INPUT_ROOT), help="Folder file TXT")
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah ulangan per file (diambil tercepat)")
+    args = parser.parse_args()
+
+    files = sorted(p for p in Path(args.input).rglob("*") if p.suffix.lower() in trace_io.TRACE_EXTS)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        svg_timings, svg_size = bench(files, plot_file_svg, tmp_dir / "svg", args.repeat)
+
+        start = time.perf_counter()
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot  # noqa: F401
+
+        import_ms = (time.perf_counter() - start) * 1000
+        mpl_timings, mpl_size = bench(files, plot_file_matplotlib, tmp_dir / "png", args.repeat)
+
+    report("svg", svg_timings, svg_size)
+    report("matplotlib", mpl_timings, mpl_size)
+    print(f"import matplotlib: {import_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+﻿import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import asset_store  # noqa: E402
+
+DEFAULT_STATIC = ROOT / "static"
+
+# vercel.json memakai "builds" (@vercel/python) yang tidak menjalankan build
+# command saat deploy dari Git, dan store/ ada di .gitignore. Jadi deploy Git
+# tetap membawa static/ utuh; store hanya ikut lewat deploy CLI.
+DEPLOY_NOTE = """Deploy Vercel dengan store (jalankan di checkout terpisah, jangan commit hasil --prune):
+  python scripts/build_asset_store.py --prune
+  vercel deploy --prod
+Vercel CLI mengunggah store/ karena .vercelignore tidak mengecualikannya.
+Deploy otomatis dari Git tidak menjalankan skrip ini."""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bangun asset store berbasis hash (sha256) dari folder static/.",
+        epilog=DEPLOY_NOTE,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--static", default=str(DEFAULT_STATIC), help="Folder sumber aset")
+    parser.add_argument("--store", default=str(asset_store.STORE_ROOT), help="Folder tujuan store + manifest")
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Hapus file asli setelah disalin ke store (untuk build deploy); "
+        "file TXT sumber grafik tidak pernah dihapus",
+    )
+    args = parser.parse_args()
+
+    stats = asset_store.build_store(Path(args.static), Path(args.store), prune=args.prune)
+    saved = stats["bytes"] - stats["stored_bytes"]
+    print(
+        f"{stats['files']} file -> {stats['blobs']} blob unik; "
+        f"{stats['bytes'] / 1024:.1f} KiB -> {stats['stored_bytes'] / 1024:.1f} KiB "
+        f"(hemat {saved / 1024:.1f} KiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+﻿import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bangun model interpolasi respons dari trace CST/AWR.")
+    parser.add_argument("--out", help="File .npz tujuan (default: RESPONSE_MODEL_PATH)")
+    parser.add_argument("--local", action="store_true", help="Baca trace dari static/ bukan dari Google Drive")
+    args = parser.parse_args()
+
+    if args.local:
+        os.environ["USE_DRIVE_ASSETS"] = "0"
+    import app as app_module
+    import response_model
+
+    start = time.perf_counter()
+    models = app_module.build_response_models()
+    elapsed = time.perf_counter() - start
+    if not models:
+        print("Tidak ada trace yang bisa dimodelkan.")
+        sys.exit(1)
+
+    out = Path(args.out) if args.out else app_module.RESPONSE_MODEL_PATH
+    out.parent.mkdir(parents=True, exist_ok=True)
+    response_model.save_models(out, models)
+    for (source, kind), model in sorted(models.items()):
+        rmse = ", ".join("-" if r != r else f"{r:.3f}" for r in model["loo_rmse"])
+        print(f"{source:<4}{kind:<12} {len(model['freqs'])} dataset, LOO RMSE [{rmse}]")
+    print(f"Model disimpan ke {out} ({out.stat().st_size / 1024:.1f} KiB, {elapsed:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,22 @@
-﻿import json
+﻿import argparse
+import json
 import re
+import sys
 from pathlib import Path
 
-import matplotlib
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.transforms as mtrans
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
 
+import trace_io  # noqa: E402
+from svg_plot import render_trace_svg  # noqa: E402
 
-ROOT = Path(__file__).resolve().parents[1]
 INPUT_ROOT = ROOT / "static" / "gambar cst file"
 OUTPUT_ROOT = ROOT / "static" / "img" / "grafik cst"
 
-FLOAT_RE = re.compile(r"[-+]?(?:\d*\.\d+|\d+)(?:[eE][-+]?\d+)?")
-
 
 def extract_freq(path: Path) -> float | None:
-    matches = re.findall(r"\d+(?:[.,]\d+)?", str(path))
+    matches = re.findall(r"\d+(?:[.,]\d+)?", str(path.with_suffix("")))
     if not matches:
         return None
     raw = matches[-1].replace(",", ".")
@@ -36,79 +35,79 @@ def freq_dir_name(freq: float | None) -> str:
     return f"{freq:g}"
 
 
-def parse_rows(file_path: Path) -> tuple[str, list[list[float]]]:
-    text = file_path.read_text(errors="ignore").splitlines()
-    header = " ".join(text[:3]).lower()
-    rows: list[list[float]] = []
-    for line in text:
-        if not re.search(r"\d", line):
-            continue
-        nums = FLOAT_RE.findall(line)
-        if len(nums) < 2:
-            continue
-        rows.append([float(n) for n in nums])
-    return header, rows
-
-
-def detect_labels(file_path: Path, header: str) -> tuple[str, str, int, int]:
-    name = file_path.stem.lower()
-    if "gain" in name:
-        y_label = "Gain (dBi)"
-    elif "vswr" in name:
-        y_label = "VSWR"
-    elif "rl" in name or "return" in name or "sparameter" in name:
-        y_label = "Return Loss (dB)"
-    elif "pola" in name:
-        y_label = "Pola (dB)"
-    else:
-        y_label = "Value"
-
-    header_l = header.lower()
-    if ("theta" in header_l) or ("angle" in header_l):
-        x_label = "Angle (deg)"
-        use_third = "abs(gain)" in header_l or "theta" in header_l
-    else:
-        x_label = "Frequency (GHz)"
-        use_third = False
-
-    x_idx = 0
-    y_idx = 2 if use_third else 1
-    return x_label, y_label, x_idx, y_idx
-
-
-def output_name(file_path: Path) -> str:
-    name = file_path.stem.lower()
-    if "gain" in name:
-        return "gain.png"
-    if "vswr" in name:
-        return "vswr.png"
-    if "rl" in name or "return" in name or "sparameter" in name:
-        return "return_loss.png"
-    if "pola" in name:
-        return "pola.png"
-    return f"{file_path.stem}.png"
-
-
-def plot_file(file_path: Path, out_dir: Path, freq: float | None) -> Path | None:
-    header, rows = parse_rows(file_path)
-    if not rows:
-        return None
+def output_name(kind: str | None, file_path: Path, ext: str = "png") -> str:
+    if kind:
+        return f"{kind}.{ext}"
+    return f"{file_path.stem}.{ext}"
 
-    x_label, y_label, x_idx, y_idx = detect_labels(file_path, header)
 
-    x_vals = []
-    y_vals = []
-    for row in rows:
-        if len(row) <= max(x_idx, y_idx):
-            continue
-        x_vals.append(row[x_idx])
-        y_vals.append(row[y_idx])
+def plot_title(y_label: str, freq: float | None) -> str:
+    if freq is not None:
+        return f"{y_label} - {freq_dir_name(freq)} GHz"
+    return y_label
+
 
-    if not x_vals:
+def load_trace(file_path: Path, kind: str | None) -> tuple[str, str, list[float], list[float]] | None:
+    trace = trace_io.load_trace(trace_io.open_lines(file_path), trace_io.trace_format(file_path.name), kind or "")
+    if trace is None:
         return None
+    return trace["x_label"], trace["y_label"], trace["x"], trace["y"]
+
+
+def plot_file(
+    file_path: Path,
+    out_dir: Path,
+    freq: float | None,
+    renderer: str = "matplotlib",
+    polar: bool = False,
+) -> list[Path]:
+    outputs = []
+    for kind in trace_io.file_kinds(file_path.name) or [None]:
+        trace = load_trace(file_path, kind)
+        if trace is None:
+            continue
+        if renderer == "svg":
+            outputs.append(plot_file_svg(file_path, out_dir, freq, trace, polar, kind))
+        else:
+            outputs.append(plot_file_matplotlib(file_path, out_dir, freq, trace, kind))
+    return outputs
+
+
+def plot_file_svg(
+    file_path: Path,
+    out_dir: Path,
+    freq: float | None,
+    trace: tuple[str, str, list[float], list[float]],
+    polar: bool = False,
+    kind: str | None = None,
+) -> Path:
+    x_label, y_label, x_vals, y_vals = trace
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / output_name(kind, file_path, "svg")
+    meta_path = out_dir / f"{out_path.name}.meta.json"
+    title = plot_title(y_label, freq)
+    svg, meta = render_trace_svg(x_vals, y_vals, x_label, y_label, title, polar)
+    out_path.write_text(svg, encoding="utf-8")
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+    return out_path
+
 
+def plot_file_matplotlib(
+    file_path: Path,
+    out_dir: Path,
+    freq: float | None,
+    trace: tuple[str, str, list[float], list[float]],
+    kind: str | None = None,
+) -> Path:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.transforms as mtrans
+
+    x_label, y_label, x_vals, y_vals = trace
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / output_name(file_path)
+    out_path = out_dir / output_name(kind, file_path)
     meta_path = out_dir / f"{out_path.stem}.meta.json"
 
     fig, ax = plt.subplots(figsize=(6.2, 4.0), dpi=140)
@@ -116,10 +115,7 @@ def plot_file(file_path: Path, out_dir: Path, freq: float | None) -> Path | None
     ax.grid(True, alpha=0.3, linestyle="--", linewidth=0.6)
     ax.set_xlabel(x_label)
     ax.set_ylabel(y_label)
-    if freq is not None:
-        ax.set_title(f"{y_label} - {freq_dir_name(freq)} GHz")
-    else:
-        ax.set_title(y_label)
+    ax.set_title(plot_title(y_label, freq))
     fig.tight_layout()
 
     fig.canvas.draw()
@@ -155,18 +151,30 @@ def plot_file(file_path: Path, out_dir: Path, freq: float | None) -> Path | None
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate grafik dari file TXT CST/AWR.")
+    parser.add_argument("--renderer", choices=("matplotlib", "svg"), default="matplotlib", help="Renderer grafik")
+    parser.add_argument("--polar", action="store_true", help="Gambar data sudut sebagai grafik polar (khusus svg)")
+    args = parser.parse_args()
+
     sources = {
         "CST": INPUT_ROOT / "CST",
         "AWR": INPUT_ROOT / "AWR",
     }
+    files = []
     for source, src_dir in sources.items():
         if not src_dir.exists():
             continue
-        for file_path in src_dir.rglob("*.txt"):
-            freq = extract_freq(file_path)
-            freq_dir = freq_dir_name(freq)
-            out_dir = OUTPUT_ROOT / source / freq_dir
-            plot_file(file_path, out_dir, freq)
+        for file_path in src_dir.rglob("*"):
+            if file_path.suffix.lower() in trace_io.TRACE_EXTS:
+                files.append((source, file_path))
+
+    # Baris "[i/n] path" dibaca oleh job rebuild di app.py untuk progres per file.
+    for idx, (source, file_path) in enumerate(files, start=1):
+        freq = extract_freq(file_path)
+        freq_dir = freq_dir_name(freq)
+        out_dir = OUTPUT_ROOT / source / freq_dir
+        plot_file(file_path, out_dir, freq, args.renderer, args.polar)
+        print(f"[{idx}/{len(files)}] {file_path.relative_to(INPUT_ROOT).as_posix()}", flush=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,252 @@
+﻿import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import types
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict, namedtuple
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+STATIC_ROOT = ROOT / "static"
+FAKE_FOLDERS = {
+    "local:img": "img",
+    "local:txt": "gambar cst file",
+}
+
+DriveItem = namedtuple("DriveItem", ["id", "path", "local_path"])
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_drive() -> tuple[ThreadingHTTPServer, str]:
+    handler = partial(QuietHandler, directory=str(STATIC_ROOT))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def install_fake_gdown() -> None:
+    # Pengganti gdown: daftar folder dibaca dari static/, id file = path relatif static/.
+    def download_folder(url=None, skip_download=False, **kwargs):
+        sub = FAKE_FOLDERS.get(url)
+        if sub is None:
+            return []
+        base = STATIC_ROOT / sub
+        items = []
+        for path in sorted(base.rglob("*")):
+            if path.is_file() and not path.name.startswith("."):
+                items.append(DriveItem(
+                    id=path.relative_to(STATIC_ROOT).as_posix(),
+                    path=path.relative_to(base).as_posix(),
+                    local_path=None,
+                ))
+        return items
+
+    sys.modules["gdown"] = types.SimpleNamespace(download_folder=download_folder)
+
+
+def load_app(drive_base: str):
+    os.environ["USE_DRIVE_ASSETS"] = "1"
+    os.environ["IMG_DRIVE_FOLDER_URL"] = "local:img"
+    os.environ["GDRIVE_FOLDER_URL"] = "local:txt"
+    install_fake_gdown()
+    sys.path.insert(0, str(ROOT))
+    import app as app_module
+
+    def drive_file_url(file_id: str, export: str = "download") -> str:
+        return f"{drive_base}/{urllib.parse.quote(file_id)}"
+
+    app_module.drive_file_url = drive_file_url
+    return app_module
+
+
+def start_app(app_module) -> tuple[object, str]:
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietWSGIHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app_module.app, threaded=True, request_handler=QuietWSGIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def frequency_assets(app_module, fanout: bool = False) -> dict[str, list[str]]:
+    # Sama seperti halaman: satu /api/bundle/<freq> lalu gambar-gambarnya. Dengan
+    # fanout, putar ulang pola lama (gambar + txt + meta per grafik, tanpa bundle).
+    assets: dict[str, list[str]] = {}
+    with app_module.app.test_request_context():
+        for freq in app_module.FREQ_OPTIONS_GHZ:
+            urls = [] if fanout else [app_module.url_for("bundle", freq=freq)]
+            urls += app_module.cst_image_urls(freq).values()
+            for source in ("CST", "AWR"):
+                urls += app_module.graph_image_urls(freq, source).values()
+                if fanout:
+                    urls += app_module.graph_data_urls_for(freq, source).values()
+                    urls += app_module.graph_meta_urls_for(freq, source).values()
+            assets[str(freq)] = [url for url in urls if url]
+    return assets
+
+
+def route_label(app_module, path: str, method: str) -> str:
+    adapter = app_module.app.url_map.bind("localhost")
+    try:
+        endpoint, _ = adapter.match(urllib.parse.unquote(path), method=method)
+    except Exception:
+        endpoint = "unknown"
+    return f"{method} {endpoint}"
+
+
+def timed_request(base: str, path: str, data: dict | None = None) -> tuple[int, float, int]:
+    body = urllib.parse.urlencode(data).encode() if data is not None else None
+    req = urllib.request.Request(base + path, data=body)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            size = len(resp.read())
+            status = resp.status
+    except urllib.error.HTTPError as exc:
+        size = len(exc.read())
+        status = exc.code
+    except Exception:
+        size = 0
+        status = 0
+    return status, time.perf_counter() - start, size
+
+
+def run_session(base: str, assets: dict[str, list[str]], rng: random.Random, calc_posts: int) -> list[tuple]:
+    results = []
+    steps = [("GET", "/", None), ("GET", "/calculator", None)]
+    freqs = list(assets)
+    for _ in range(calc_posts):
+        steps.append(("POST", "/api/calculator", {
+            "freq": rng.choice(freqs),
+            "er": round(rng.uniform(2.2, 10.2), 2),
+            "h": round(rng.uniform(0.5, 3.2), 2),
+            "wf": round(rng.uniform(1.0, 5.0), 2),
+        }))
+    for url in assets[rng.choice(freqs)]:
+        steps.append(("GET", urllib.parse.urlsplit(url).path, None))
+    for method, path, data in steps:
+        status, elapsed, size = timed_request(base, path, data)
+        results.append((method, path, status, elapsed, size))
+    return results
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def summarize(app_module, results: list[tuple], wall: float) -> dict:
+    per_route: dict[str, list[tuple]] = defaultdict(list)
+    for method, path, status, elapsed, size in results:
+        per_route[route_label(app_module, path, method)].append((status, elapsed, size))
+    routes = {}
+    for label, rows in sorted(per_route.items()):
+        latencies = [row[1] * 1000 for row in rows]
+        routes[label] = {
+            "count": len(rows),
+            "errors": sum(1 for row in rows if row[0] == 0 or row[0] >= 500),
+            "status": dict(sorted(
+                (str(code), sum(1 for row in rows if row[0] == code)) for code in {row[0] for row in rows}
+            )),
+            "bytes": sum(row[2] for row in rows),
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "mean_ms": statistics.fmean(latencies),
+        }
+    return {
+        "requests": len(results),
+        "duration_s": wall,
+        "throughput_rps": len(results) / wall if wall else 0.0,
+        "routes": routes,
+    }
+
+
+def print_summary(summary: dict) -> None:
+    print(
+        f"{summary['requests']} request dalam {summary['duration_s']:.2f} s "
+        f"({summary['throughput_rps']:.1f} req/s)"
+    )
+    print(f"{'route':<28}{'n':>6}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, row in summary["routes"].items():
+        print(
+            f"{label:<28}{row['count']:>6}{row['errors']:>5}"
+            f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test aplikasi Flask dengan Drive palsu dari static/.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Jumlah sesi paralel")
+    parser.add_argument("--sessions", type=int, default=40, help="Total sesi yang diputar ulang")
+    parser.add_argument("--calc-posts", type=int, default=3, help="POST /api/calculator per sesi")
+    parser.add_argument("--seed", type=int, default=0, help="Seed input acak")
+    parser.add_argument("--out", help="Simpan hasil sebagai JSON")
+    parser.add_argument("--label", default="", help="Label versi untuk file JSON")
+    parser.add_argument("--fanout", action="store_true", help="Pola request lama: txt + meta per grafik, tanpa /api/bundle")
+    args = parser.parse_args()
+
+    drive_server, drive_base = start_fake_drive()
+    app_module = load_app(drive_base)
+    app_server, base = start_app(app_module)
+    assets = frequency_assets(app_module, args.fanout)
+
+    results: list[tuple] = []
+    lock = threading.Lock()
+    counter = iter(range(args.sessions))
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(args.seed * 1000 + worker_id)
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            session = run_session(base, assets, rng, args.calc_posts)
+            with lock:
+                results.extend(session)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    app_server.shutdown()
+    drive_server.shutdown()
+
+    summary = summarize(app_module, results, wall)
+    summary["config"] = {
+        "label": args.label,
+        "concurrency": args.concurrency,
+        "sessions": args.sessions,
+        "calc_posts": args.calc_posts,
+        "seed": args.seed,
+        "fanout": args.fanout,
+    }
+    print_summary(summary)
+    if args.out:
+        Path(args.out).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+        print(f"Hasil disimpan ke {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+﻿import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa flock, cache bersama dimatikan.
+    fcntl = None
+
+
+ROOT = Path(__file__).resolve().parent
+
+
+def _default_dir() -> Path:
+    # /dev/shm = tmpfs (RAM); nama diberi hash path repo agar dua instalasi tidak bercampur.
+    shm = Path("/dev/shm")
+    if shm.is_dir():
+        return shm / f"ta-riswan-{hashlib.sha1(str(ROOT).encode()).hexdigest()[:8]}"
+    return ROOT / "store" / "cache"
+
+
+CACHE_DIR = Path(os.getenv("SHARED_CACHE_DIR", str(_default_dir())))
+ENABLED = fcntl is not None and os.getenv("SHARED_CACHE", "1").lower() in {"1", "true", "yes", "on"}
+VERSION_FILE = "version"
+HEADER = struct.Struct("<Q")
+
+_version_map: mmap.mmap | None = None
+
+
+def _disable(exc: OSError) -> None:
+    # Folder cache tidak bisa ditulis (mis. /var/task read-only di Vercel):
+    # matikan cache bersama, app tetap jalan dengan cache per proses.
+    global ENABLED
+    if ENABLED:
+        print(f"[cache] cache bersama dimatikan: {exc}")
+    ENABLED = False
+
+
+def _acquire(name: str):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fh = open(CACHE_DIR / f"{name}.lock", "a+b")
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+    except OSError:
+        fh.close()
+        raise
+    return fh
+
+
+def _release(fh) -> None:
+    fcntl.flock(fh, fcntl.LOCK_UN)
+    fh.close()
+
+
+@contextmanager
+def _locked(name: str):
+    fh = _acquire(name)
+    try:
+        yield
+    finally:
+        _release(fh)
+
+
+def _version_view() -> mmap.mmap:
+    # Penghitung versi 8 byte di file yang di-mmap: dibaca tiap request tanpa syscall.
+    global _version_map
+    if _version_map is None:
+        path = CACHE_DIR / VERSION_FILE
+        with _locked(VERSION_FILE):
+            if not path.exists() or path.stat().st_size < HEADER.size:
+                path.write_bytes(HEADER.pack(0))
+        with open(path, "r+b") as fh:
+            _version_map = mmap.mmap(fh.fileno(), HEADER.size)
+    return _version_map
+
+
+def version() -> int:
+    if not ENABLED:
+        return 0
+    try:
+        view = _version_view()
+    except OSError as exc:
+        _disable(exc)
+        return 0
+    return HEADER.unpack(view[:HEADER.size])[0]
+
+
+def bump_version() -> int:
+    # Invalidasi: semua entri versi lama tidak dipakai lagi lalu dihapus.
+    if not ENABLED:
+        return 0
+    try:
+        view = _version_view()
+        with _locked(VERSION_FILE):
+            new = HEADER.unpack(view[:HEADER.size])[0] + 1
+            view[:HEADER.size] = HEADER.pack(new)
+            view.flush()
+    except OSError as exc:
+        _disable(exc)
+        return 0
+    for old in CACHE_DIR.glob("v*"):
+        if old.is_dir() and old.name != f"v{new}":
+            shutil.rmtree(old, ignore_errors=True)
+    return new
+
+
+def _entry_path(key: str) -> Path:
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"v{version()}" / digest
+
+
+def _write_atomic(path: Path, payload: list[bytes]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        for part in payload:
+            fh.write(part)
+    os.replace(tmp, path)
+
+
+def _fill(key: str, read: Callable, write: Callable, build: Callable):
+    if not ENABLED:
+        return build()
+    path = _entry_path(key)
+    if not ENABLED:  # version() bisa mematikan cache jika folder tidak bisa dibuat.
+        return build()
+    value = read(path)
+    if value is not None:
+        return value
+    # Hanya satu worker yang mengisi; worker lain menunggu lalu membaca hasilnya.
+    try:
+        lock = _acquire(path.name)
+    except OSError as exc:
+        _disable(exc)
+        return build()
+    try:
+        value = read(path)
+        if value is not None:
+            return value
+        value = build()
+        if value is not None:
+            try:
+                write(path, value)
+            except OSError as exc:
+                _disable(exc)
+            else:
+                # Baca ulang supaya worker pengisi juga memakai salinan bersama (mmap).
+                value = read(path) or value
+    finally:
+        _release(lock)
+    return value
+
+
+def _read_json(path: Path):
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, value) -> None:
+    _write_atomic(path, [json.dumps(value, separators=(",", ":")).encode("utf-8")])
+
+
+def fill_json(key: str, build: Callable):
+    # build() -> objek JSON; None berarti gagal dan tidak disimpan.
+    return _fill(key, _read_json, _write_json, build)
+
+
+def _read_arrays(path: Path):
+    # Layout: [panjang header][header JSON][padding][float64 ...]. Array dikembalikan
+    # sebagai memoryview atas mmap, jadi halaman memorinya dipakai bersama antar worker.
+    try:
+        with open(path, "rb") as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    size = HEADER.unpack(mm[:HEADER.size])[0]
+    header = json.loads(mm[HEADER.size:HEADER.size + size])
+    offset = _align(HEADER.size + size)
+    view = memoryview(mm)
+    arrays = {}
+    for name, count in header["arrays"]:
+        arrays[name] = view[offset:offset + count * 8].cast("d")
+        offset += count * 8
+    return header["meta"], arrays
+
+
+def _write_arrays(path: Path, value) -> None:
+    meta, arrays = value
+    header = json.dumps({"meta": meta, "arrays": [[name, len(arr)] for name, arr in arrays.items()]}).encode("utf-8")
+    padding = b"\0" * (_align(HEADER.size + len(header)) - HEADER.size - len(header))
+    payload = [HEADER.pack(len(header)), header, padding]
+    payload += [array("d", arr).tobytes() for arr in arrays.values()]
+    _write_atomic(path, payload)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def fill_arrays(key: str, build: Callable):
+    # build() -> (meta JSON, {nama: array float}).
+    return _fill(key, _read_arrays, _write_arrays, build)
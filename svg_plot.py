@@ -0,0 +1,293 @@
+﻿import math
+from xml.sax.saxutils import escape
+
+
+# Ukuran kanvas sama dengan figsize=(6.2, 4.0) dpi=140 pada versi matplotlib.
+WIDTH = 868
+HEIGHT = 560
+LINE_COLOR = "#1f7a8c"
+FONT_FAMILY = "DejaVu Sans, Arial, sans-serif"
+TICK_FONT = 19.4
+LABEL_FONT = 19.4
+TITLE_FONT = 23.3
+CHAR_WIDTH = 0.6  # perkiraan lebar karakter relatif terhadap ukuran font
+TICK_LEN = 6.8
+EDGE = 8.0
+
+
+def _autoscale(lo: float, hi: float) -> tuple[float, float]:
+    if hi == lo:
+        delta = abs(lo) * 0.05 or 1.0
+        return lo - delta, hi + delta
+    margin = (hi - lo) * 0.05
+    return lo - margin, hi + margin
+
+
+def nice_ticks(lo: float, hi: float, max_ticks: int = 9) -> tuple[list[float], int]:
+    span = hi - lo
+    if span <= 0:
+        return [lo], 0
+    raw = span / max_ticks
+    base = 10 ** math.floor(math.log10(raw))
+    step = base * 10
+    for mult in (1, 2, 2.5, 5, 10):
+        if base * mult >= raw:
+            step = base * mult
+            break
+    decimals = max(0, -math.floor(math.log10(step) + 1e-9))
+    if abs(step / 10 ** -decimals - round(step / 10 ** -decimals)) > 1e-6:
+        decimals += 1
+    first = math.ceil(lo / step - 1e-9) * step
+    ticks = []
+    value = first
+    while value <= hi + step * 1e-9:
+        ticks.append(round(value, decimals + 6))
+        value += step
+    return ticks, decimals
+
+
+def _tick_label(value: float, decimals: int) -> str:
+    text = f"{value:.{decimals}f}"
+    if float(text) == 0:
+        text = text.lstrip("-")
+    return text.replace("-", "−")
+
+
+def _text_width(text: str, size: float) -> float:
+    return len(text) * size * CHAR_WIDTH
+
+
+def _decimate(points: list[tuple[float, float]], columns: int) -> list[tuple[float, float]]:
+    # Simpan titik min/max per kolom piksel agar bentuk puncak tetap utuh.
+    if len(points) <= columns * 2:
+        return points
+    out: list[tuple[float, float]] = []
+    bucket: list[tuple[float, float]] = []
+    current = None
+    for pt in points:
+        col = int(pt[0])
+        if current is not None and col != current:
+            out.extend(_bucket_extremes(bucket))
+            bucket = []
+        current = col
+        bucket.append(pt)
+    if bucket:
+        out.extend(_bucket_extremes(bucket))
+    return out
+
+
+def _bucket_extremes(bucket: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    if len(bucket) <= 2:
+        return bucket
+    lo = min(bucket, key=lambda p: p[1])
+    hi = max(bucket, key=lambda p: p[1])
+    pair = sorted({lo, hi}, key=bucket.index)
+    return [bucket[0], *pair, bucket[-1]]
+
+
+def _path(points: list[tuple[float, float]]) -> str:
+    return " ".join(f"{x:.1f},{y:.1f}" for x, y in points)
+
+
+def _svg_open() -> list[str]:
+    return [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+        f'viewBox="0 0 {WIDTH} {HEIGHT}" font-family="{FONT_FAMILY}">',
+        f'<rect width="{WIDTH}" height="{HEIGHT}" fill="#fff"/>',
+    ]
+
+
+def render_line_svg(
+    x_vals: list[float],
+    y_vals: list[float],
+    x_label: str,
+    y_label: str,
+    title: str | None = None,
+) -> tuple[str, dict]:
+    if not x_vals:
+        raise ValueError("Data grafik kosong.")
+    xlim = _autoscale(min(x_vals), max(x_vals))
+    ylim = _autoscale(min(y_vals), max(y_vals))
+    x_ticks, x_dec = nice_ticks(*xlim)
+    y_ticks, y_dec = nice_ticks(*ylim)
+    y_labels = [_tick_label(v, y_dec) for v in y_ticks]
+    x_labels = [_tick_label(v, x_dec) for v in x_ticks]
+
+    y_tick_w = max(_text_width(t, TICK_FONT) for t in y_labels)
+    left = EDGE + LABEL_FONT + 8 + y_tick_w + 6 + TICK_LEN
+    right = WIDTH - EDGE - _text_width(x_labels[-1], TICK_FONT) / 2
+    top = EDGE + (TITLE_FONT + 10 if title else TICK_FONT / 2)
+    bottom = HEIGHT - (EDGE + LABEL_FONT + 8 + TICK_FONT + 6 + TICK_LEN)
+    plot_w = right - left
+    plot_h = bottom - top
+
+    def px(x: float) -> float:
+        return left + (x - xlim[0]) / (xlim[1] - xlim[0]) * plot_w
+
+    def py(y: float) -> float:
+        return bottom - (y - ylim[0]) / (ylim[1] - ylim[0]) * plot_h
+
+    parts = _svg_open()
+    grid = []
+    ticks = []
+    for value, text in zip(x_ticks, x_labels):
+        gx = px(value)
+        grid.append(f"M{gx:.1f} {top:.1f}V{bottom:.1f}")
+        ticks.append(f"M{gx:.1f} {bottom:.1f}v{TICK_LEN}")
+        parts.append(
+            f'<text x="{gx:.1f}" y="{bottom + TICK_LEN + 6 + TICK_FONT * 0.8:.1f}" '
+            f'font-size="{TICK_FONT}" text-anchor="middle">{text}</text>'
+        )
+    for value, text in zip(y_ticks, y_labels):
+        gy = py(value)
+        grid.append(f"M{left:.1f} {gy:.1f}H{right:.1f}")
+        ticks.append(f"M{left:.1f} {gy:.1f}h{-TICK_LEN}")
+        parts.append(
+            f'<text x="{left - TICK_LEN - 6:.1f}" y="{gy + TICK_FONT * 0.35:.1f}" '
+            f'font-size="{TICK_FONT}" text-anchor="end">{text}</text>'
+        )
+    parts.append(
+        f'<path d="{" ".join(grid)}" stroke="#b0b0b0" stroke-opacity="0.3" '
+        f'stroke-width="1.2" stroke-dasharray="4.3,1.9" fill="none"/>'
+    )
+    parts.append(f'<path d="{" ".join(ticks)}" stroke="#000" stroke-width="1.6"/>')
+
+    points = [(px(x), py(y)) for x, y in zip(x_vals, y_vals)]
+    points = _decimate(points, int(plot_w))
+    parts.append(
+        f'<clipPath id="plot"><rect x="{left:.1f}" y="{top:.1f}" '
+        f'width="{plot_w:.1f}" height="{plot_h:.1f}"/></clipPath>'
+    )
+    parts.append(
+        f'<polyline points="{_path(points)}" fill="none" stroke="{LINE_COLOR}" '
+        f'stroke-width="3.1" stroke-linejoin="round" clip-path="url(#plot)"/>'
+    )
+    parts.append(
+        f'<rect x="{left:.1f}" y="{top:.1f}" width="{plot_w:.1f}" height="{plot_h:.1f}" '
+        f'fill="none" stroke="#000" stroke-width="1.6"/>'
+    )
+    parts.append(
+        f'<text x="{left + plot_w / 2:.1f}" y="{HEIGHT - EDGE:.1f}" '
+        f'font-size="{LABEL_FONT}" text-anchor="middle">{escape(x_label)}</text>'
+    )
+    label_x = EDGE + LABEL_FONT * 0.8
+    label_y = top + plot_h / 2
+    parts.append(
+        f'<text x="{label_x:.1f}" y="{label_y:.1f}" font-size="{LABEL_FONT}" text-anchor="middle" '
+        f'transform="rotate(-90 {label_x:.1f} {label_y:.1f})">{escape(y_label)}</text>'
+    )
+    if title:
+        parts.append(
+            f'<text x="{left + plot_w / 2:.1f}" y="{EDGE + TITLE_FONT * 0.8:.1f}" '
+            f'font-size="{TITLE_FONT}" text-anchor="middle">{escape(title)}</text>'
+        )
+    parts.append("</svg>")
+
+    meta = {
+        "pad": {
+            "left": left / WIDTH,
+            "right": (WIDTH - right) / WIDTH,
+            "top": top / HEIGHT,
+            "bottom": (HEIGHT - bottom) / HEIGHT,
+        },
+        "xlim": [float(xlim[0]), float(xlim[1])],
+        "ylim": [float(ylim[0]), float(ylim[1])],
+    }
+    return "\n".join(parts), meta
+
+
+def render_polar_svg(
+    angles_deg: list[float],
+    values: list[float],
+    label: str,
+    title: str | None = None,
+) -> tuple[str, dict]:
+    if not angles_deg:
+        raise ValueError("Data grafik kosong.")
+    rlim = (min(values), max(values))
+    if rlim[0] == rlim[1]:
+        rlim = _autoscale(*rlim)
+    r_ticks, r_dec = nice_ticks(*rlim, max_ticks=5)
+
+    top = EDGE + (TITLE_FONT + 10 if title else 0) + TICK_FONT + 4
+    bottom = HEIGHT - EDGE - LABEL_FONT - 8
+    radius = (bottom - top) / 2
+    cx = WIDTH / 2
+    cy = top + radius
+
+    def point(angle: float, value: float) -> tuple[float, float]:
+        # 0 derajat di atas, searah jarum jam (konvensi pola radiasi).
+        r = (value - rlim[0]) / (rlim[1] - rlim[0]) * radius
+        rad = math.radians(angle)
+        return cx + r * math.sin(rad), cy - r * math.cos(rad)
+
+    parts = _svg_open()
+    grid = []
+    for value in r_ticks:
+        r = (value - rlim[0]) / (rlim[1] - rlim[0]) * radius
+        if r <= 0:
+            continue
+        grid.append(f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{r:.1f}"/>')
+        parts.append(
+            f'<text x="{cx + 4:.1f}" y="{cy - r - 3:.1f}" font-size="{TICK_FONT * 0.8:.1f}" '
+            f'fill="#555">{_tick_label(value, r_dec)}</text>'
+        )
+    for angle in range(0, 360, 30):
+        ex, ey = point(angle, rlim[1])
+        grid.append(f'<line x1="{cx:.1f}" y1="{cy:.1f}" x2="{ex:.1f}" y2="{ey:.1f}"/>')
+        lx, ly = point(angle, rlim[1] + (rlim[1] - rlim[0]) * 0.07)
+        parts.append(
+            f'<text x="{lx:.1f}" y="{ly + TICK_FONT * 0.35:.1f}" font-size="{TICK_FONT}" '
+            f'text-anchor="middle">{angle}°</text>'
+        )
+    parts.append(
+        f'<g stroke="#b0b0b0" stroke-opacity="0.6" stroke-width="1.2" '
+        f'stroke-dasharray="4.3,1.9" fill="none">{"".join(grid)}</g>'
+    )
+    points = [point(a, v) for a, v in zip(angles_deg, values)]
+    parts.append(
+        f'<polyline points="{_path(points)}" fill="none" stroke="{LINE_COLOR}" '
+        f'stroke-width="3.1" stroke-linejoin="round"/>'
+    )
+    parts.append(
+        f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{radius:.1f}" fill="none" stroke="#000" stroke-width="1.6"/>'
+    )
+    parts.append(
+        f'<text x="{cx:.1f}" y="{HEIGHT - EDGE:.1f}" font-size="{LABEL_FONT}" '
+        f'text-anchor="middle">{escape(label)}</text>'
+    )
+    if title:
+        parts.append(
+            f'<text x="{cx:.1f}" y="{EDGE + TITLE_FONT * 0.8:.1f}" font-size="{TITLE_FONT}" '
+            f'text-anchor="middle">{escape(title)}</text>'
+        )
+    parts.append("</svg>")
+
+    # Kontrak sama dengan grafik garis: pad = kotak pembatas lingkaran, xlim =
+    # sudut (0 di atas, searah jarum jam), ylim = rentang radial.
+    meta = {
+        "polar": True,
+        "pad": {
+            "left": (cx - radius) / WIDTH,
+            "right": (WIDTH - cx - radius) / WIDTH,
+            "top": (cy - radius) / HEIGHT,
+            "bottom": (HEIGHT - cy - radius) / HEIGHT,
+        },
+        "xlim": [0.0, 360.0],
+        "ylim": [float(rlim[0]), float(rlim[1])],
+    }
+    return "\n".join(parts), meta
+
+
+def render_trace_svg(
+    x_vals: list[float],
+    y_vals: list[float],
+    x_label: str,
+    y_label: str,
+    title: str | None = None,
+    polar: bool = False,
+) -> tuple[str, dict]:
+    # Hanya data sudut yang bisa digambar polar; sisanya tetap grafik garis.
+    if polar and x_label == "Angle (deg)":
+        return render_polar_svg(x_vals, y_vals, y_label, title)
+    return render_line_svg(x_vals, y_vals, x_label, y_label, title)
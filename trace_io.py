@@ -0,0 +1,316 @@
+﻿import csv
+import math
+import mmap
+import re
+from array import array
+from itertools import chain, islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator
+
+
+FLOAT_RE = re.compile(r"[-+]?(?:\d*\.\d+|\d+)(?:[eE][-+]?\d+)?")
+LETTER_RE = re.compile(r"[A-Za-z]")
+TRACE_EXTS = (".txt", ".csv", ".s1p", ".s2p")
+CHUNK_SIZE = 8192
+MAX_POINTS = 4096
+
+KIND_KEYWORDS = {
+    "gain": ("gain",),
+    "vswr": ("vswr",),
+    "return_loss": ("return", "rl", "sparameter"),
+    "pola": ("pola",),
+}
+Y_LABELS = {
+    "gain": "Gain (dBi)",
+    "vswr": "VSWR",
+    "return_loss": "Return Loss (dB)",
+    "pola": "Pola (dB)",
+}
+TOUCHSTONE_KINDS = ("return_loss", "vswr")
+FREQ_SCALE_GHZ = {"hz": 1e-9, "khz": 1e-6, "mhz": 1e-3, "ghz": 1.0}
+
+
+def trace_format(name: str) -> str:
+    suffix = Path(name).suffix.lower()
+    if suffix in {".s1p", ".s2p"}:
+        return "touchstone"
+    if suffix == ".csv":
+        return "csv"
+    return "txt"
+
+
+def kind_from_name(name: str) -> str | None:
+    stem = Path(name).stem.lower()
+    for kind, keywords in KIND_KEYWORDS.items():
+        if any(key in stem for key in keywords):
+            return kind
+    return None
+
+
+def file_kinds(name: str) -> list[str]:
+    if trace_format(name) == "touchstone":
+        return list(TOUCHSTONE_KINDS)
+    kind = kind_from_name(name)
+    return [kind] if kind else []
+
+
+def name_matches_kind(name: str, kind: str) -> bool:
+    if not name.lower().endswith(TRACE_EXTS):
+        return False
+    return kind in file_kinds(name)
+
+
+def open_lines(path: Path) -> Iterator[str]:
+    # mmap + readline: file ratusan MB dibaca per baris tanpa dimuat utuh ke memori.
+    with open(path, "rb") as fh:
+        if fh.seek(0, 2) == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                yield raw.decode("utf-8", errors="ignore")
+
+
+def stream_lines(stream: IO[bytes]) -> Iterator[str]:
+    with stream:
+        for raw in stream:
+            yield raw.decode("utf-8", errors="ignore")
+
+
+def _txt_info(head: list[str], kind: str) -> tuple[dict, int]:
+    header = " ".join(head).lower()
+    first_row = next((FLOAT_RE.findall(line) for line in head if len(FLOAT_RE.findall(line)) >= 2), [])
+    is_angle = ("theta" in header) or ("angle" in header)
+    has_abs_gain = ("abs(gain)" in header) or ("abs(theta)" in header) or ("abs(phi)" in header)
+    y_idx = 2 if has_abs_gain and (not first_row or len(first_row) > 2) else 1
+    return _info(kind, is_angle), y_idx
+
+
+def _info(kind: str, is_angle: bool) -> dict:
+    return {
+        "kind": kind,
+        "x_label": "Angle (deg)" if is_angle else "Frequency (GHz)",
+        "y_label": Y_LABELS.get(kind, "Value"),
+    }
+
+
+def _txt_points(lines: Iterable[str], y_idx: int) -> Iterator[tuple[float, float]]:
+    in_header = True
+    for line in lines:
+        nums = FLOAT_RE.findall(line)
+        if len(nums) <= y_idx:
+            continue
+        if in_header:
+            # Judul kolom AWR/CST juga memuat angka ("DB(|SF_TPwr(0,0)|)", "S1,1"):
+            # baris yang masih berisi huruf di luar angka dilewati sampai data pertama.
+            if LETTER_RE.search(FLOAT_RE.sub("", line)):
+                continue
+            in_header = False
+        yield float(nums[0]), float(nums[y_idx])
+
+
+def _csv_points(lines: Iterable[str], y_idx: int) -> Iterator[tuple[float, float]]:
+    for row in csv.reader(lines):
+        if len(row) <= y_idx:
+            continue
+        try:
+            x, y = float(row[0]), float(row[y_idx])
+        except ValueError:
+            continue
+        # float() menerima "nan"/"inf": tidak valid di JSON dan merusak skala grafik.
+        if math.isfinite(x) and math.isfinite(y):
+            yield x, y
+
+
+def _csv_has_header(head: list[str]) -> bool:
+    # Baris pertama dianggap judul kolom hanya jika dua sel pertamanya bukan angka.
+    row = next(csv.reader(head[:1]), [])
+    try:
+        float(row[0])
+        float(row[1])
+    except (IndexError, ValueError):
+        return bool(row)
+    return False
+
+
+def _csv_info(head: list[str], kind: str, has_header: bool) -> tuple[dict, int]:
+    columns = [col.strip().lower() for col in next(csv.reader(head[:1]), [])] if has_header else []
+    is_angle = bool(columns) and any(key in columns[0] for key in ("theta", "angle", "deg"))
+    y_idx = 1
+    keywords = KIND_KEYWORDS.get(kind, ())
+    for idx, col in enumerate(columns[1:], start=1):
+        if any(key in col for key in keywords) or (kind == "gain" and "abs(" in col):
+            y_idx = idx
+            break
+    return _info(kind, is_angle), y_idx
+
+
+def _touchstone_points(lines: Iterable[str], kind: str) -> Iterator[tuple[float, float]]:
+    freq_scale = FREQ_SCALE_GHZ["ghz"]
+    data_format = "ma"
+    for line in lines:
+        line = line.split("!", 1)[0].strip()
+        if not line or line.startswith("["):
+            continue
+        if line.startswith("#"):
+            for token in line[1:].lower().split():
+                if token in FREQ_SCALE_GHZ:
+                    freq_scale = FREQ_SCALE_GHZ[token]
+                elif token in {"ma", "db", "ri"}:
+                    data_format = token
+            continue
+        nums = line.split()
+        if len(nums) < 3:
+            continue
+        try:
+            freq, a, b = float(nums[0]), float(nums[1]), float(nums[2])
+        except ValueError:
+            continue
+        if not (math.isfinite(freq) and math.isfinite(a) and math.isfinite(b)):
+            continue
+        if data_format == "db":
+            mag = 10 ** (a / 20)
+        elif data_format == "ri":
+            mag = math.hypot(a, b)
+        else:
+            mag = abs(a)
+        yield freq * freq_scale, s11_to_value(mag, kind)
+
+
+def s11_to_value(mag: float, kind: str) -> float:
+    mag = min(max(mag, 1e-12), 0.999999)
+    if kind == "vswr":
+        return (1 + mag) / (1 - mag)
+    # Konvensi file CST: S11 dalam dB (negatif).
+    return 20 * math.log10(mag)
+
+
+def open_trace(
+    lines: Iterable[str],
+    fmt: str,
+    kind: str,
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[dict, Iterator[tuple[array, array]]]:
+    lines = iter(lines)
+    if fmt == "touchstone":
+        info = _info(kind, False)
+        points = _touchstone_points(lines, kind)
+    else:
+        head = list(islice(lines, 3))
+        if fmt == "csv":
+            has_header = _csv_has_header(head)
+            info, y_idx = _csv_info(head, kind, has_header)
+            points = _csv_points(chain(head[1:] if has_header else head, lines), y_idx)
+        else:
+            info, y_idx = _txt_info(head, kind)
+            points = _txt_points(chain(head, lines), y_idx)
+    return info, _chunked(points, chunk_size)
+
+
+def _chunked(points: Iterator[tuple[float, float]], chunk_size: int) -> Iterator[tuple[array, array]]:
+    xs = array("d")
+    ys = array("d")
+    for x, y in points:
+        xs.append(x)
+        ys.append(y)
+        if len(xs) >= chunk_size:
+            yield xs, ys
+            xs = array("d")
+            ys = array("d")
+    if xs:
+        yield xs, ys
+
+
+def reduce_chunks(
+    chunks: Iterable[tuple[array, array]],
+    max_points: int = MAX_POINTS,
+) -> tuple[list[float], list[float]]:
+    # Trace dengan <= max_points titik dikembalikan utuh. Di atas itu titik
+    # dimasukkan ke ember (first, min, max, last) per `width` titik; jika jumlah
+    # ember melewati batas, pasangan ember digabung dan width digandakan, sehingga
+    # memori tetap O(max_points) dan titik ekstrem (xlim/ylim) tidak hilang.
+    limit = max(1, max_points // 4)
+    width = 1
+    buckets: list[list[tuple[float, float]]] = []
+    current: list[tuple[float, float]] | None = None
+    count = 0
+    # Titik mentah disimpan sebagai array("d") (8 byte per nilai), bukan tuple.
+    raw_x: array | None = array("d")
+    raw_y: array | None = array("d")
+
+    def add(pt: tuple[float, float]) -> None:
+        nonlocal buckets, current, count, width
+        if current is None:
+            current = [pt, pt, pt, pt]
+            count = 0
+        else:
+            if pt[1] < current[1][1]:
+                current[1] = pt
+            if pt[1] > current[2][1]:
+                current[2] = pt
+            current[3] = pt
+        count += 1
+        if count >= width:
+            buckets.append(current)
+            current = None
+            if len(buckets) > limit:
+                buckets = [_merge(buckets[i:i + 2]) for i in range(0, len(buckets), 2)]
+                width *= 2
+
+    for xs, ys in chunks:
+        if raw_x is not None:
+            raw_x.extend(xs)
+            raw_y.extend(ys)
+            if len(raw_x) <= max_points:
+                continue
+            for pt in zip(raw_x, raw_y):
+                add(pt)
+            raw_x = raw_y = None
+            continue
+        for pt in zip(xs, ys):
+            add(pt)
+    if raw_x is not None:
+        return raw_x.tolist(), raw_y.tolist()
+    if current is not None:
+        buckets.append(current)
+
+    x_vals: list[float] = []
+    y_vals: list[float] = []
+    for bucket in buckets:
+        ordered = [bucket[0]]
+        for pt in sorted(bucket[1:3], key=lambda p: p[0]) + [bucket[3]]:
+            if pt != ordered[-1]:
+                ordered.append(pt)
+        for x, y in ordered:
+            x_vals.append(x)
+            y_vals.append(y)
+    return x_vals, y_vals
+
+
+def _merge(pair: list[list[tuple[float, float]]]) -> list[tuple[float, float]]:
+    if len(pair) == 1:
+        return pair[0]
+    a, b = pair
+    low = a[1] if a[1][1] <= b[1][1] else b[1]
+    high = a[2] if a[2][1] >= b[2][1] else b[2]
+    return [a[0], low, high, b[3]]
+
+
+def load_trace(
+    lines: Iterable[str],
+    fmt: str,
+    kind: str,
+    max_points: int = MAX_POINTS,
+) -> dict | None:
+    info, chunks = open_trace(lines, fmt, kind)
+    x_vals, y_vals = reduce_chunks(chunks, max_points)
+    if not x_vals:
+        return None
+    return {**info, "x": x_vals, "y": y_vals}
+
+
+def iter_trace_text(lines: Iterable[str], fmt: str, kind: str) -> Iterator[str]:
+    # Normalisasi ke TXT dua kolom agar parser di index.html tetap bisa dipakai.
+    info, chunks = open_trace(lines, fmt, kind)
+    yield f"{info['x_label']}\t{info['y_label']}\n"
+    for xs, ys in chunks:
+        yield "".join(f"{x:.9g}\t{y:.9g}\n" for x, y in zip(xs, ys))
@@ -0,0 +1,100 @@
+﻿from array import array
+from bisect import bisect_left, bisect_right
+
+
+def _increasing_run(x_vals) -> tuple[int, int]:
+    # (start, stop) potongan x naik-ketat terpanjang; yang pertama jika sama panjang.
+    best = (0, min(1, len(x_vals)))
+    start = 0
+    for i in range(1, len(x_vals) + 1):
+        if i == len(x_vals) or x_vals[i] <= x_vals[i - 1]:
+            if i - start > best[1] - best[0]:
+                best = (start, i)
+            start = i
+    return best
+
+
+def monotone_run(x_vals: list[float], y_vals: list[float]) -> tuple[list[float], list[float]]:
+    # File gain CST berisi beberapa potongan phi (theta 0..180 berulang).
+    # Ambil satu potongan monoton terpanjang (dibalik jika x turun), bukan
+    # mengurutkan semua titik yang akan mencampur potongan-potongan itu.
+    start, stop = _increasing_run(x_vals)
+    down_start, down_stop = _increasing_run([-x for x in x_vals])
+    if down_stop - down_start > stop - start:
+        return x_vals[down_start:down_stop][::-1], y_vals[down_start:down_stop][::-1]
+    return x_vals[start:stop], y_vals[start:stop]
+
+
+def build_pyramid(x_vals: list[float], y_vals: list[float]) -> dict:
+    # Level 0 = titik asli dari satu potongan x naik. Level k+1 menggabungkan dua
+    # ember level k dan menyimpan titik min/max-nya, jadi total memori ~2n.
+    x_vals, y_vals = monotone_run(x_vals, y_vals)
+    xs = array("d", x_vals)
+    ys = array("d", y_vals)
+    levels = [(xs, ys, xs, ys)]
+    while len(levels[-1][0]) > 1:
+        min_x, min_y, max_x, max_y = levels[-1]
+        n_min_x, n_min_y, n_max_x, n_max_y = array("d"), array("d"), array("d"), array("d")
+        for i in range(0, len(min_x), 2):
+            j = i + 1 if i + 1 < len(min_x) else i
+            lo = i if min_y[i] <= min_y[j] else j
+            hi = i if max_y[i] >= max_y[j] else j
+            n_min_x.append(min_x[lo])
+            n_min_y.append(min_y[lo])
+            n_max_x.append(max_x[hi])
+            n_max_y.append(max_y[hi])
+        levels.append((n_min_x, n_min_y, n_max_x, n_max_y))
+    return {"x": xs, "levels": levels}
+
+
+def query_pyramid(pyramid: dict, x0: float, x1: float, width: int) -> dict:
+    xs = pyramid["x"]
+    levels = pyramid["levels"]
+    width = max(1, int(width))
+    # Satu titik di luar tiap sisi supaya garis tetap tersambung ke tepi jendela.
+    i0 = max(0, bisect_left(xs, x0) - 1)
+    i1 = min(len(xs), bisect_right(xs, x1) + 1)
+    if i1 <= i0:
+        return {"x": [], "y": [], "level": 0}
+
+    level = 0
+    while level + 1 < len(levels) and ((i1 - i0) >> level) > width:
+        level += 1
+    min_x, min_y, max_x, max_y = levels[level]
+    b0 = i0 >> level
+    b1 = ((i1 - 1) >> level) + 1
+
+    out_x: list[float] = []
+    out_y: list[float] = []
+    for b in range(b0, b1):
+        first = (min_x[b], min_y[b])
+        second = (max_x[b], max_y[b])
+        if second[0] < first[0]:
+            first, second = second, first
+        out_x.append(first[0])
+        out_y.append(first[1])
+        if level and second != first:
+            out_x.append(second[0])
+            out_y.append(second[1])
+    return {"x": out_x, "y": out_y, "level": level}
+
+
+def flatten_pyramid(pyramid: dict) -> dict:
+    # Bentuk datar {nama: array} untuk shared_cache; level 0 cukup x dan y.
+    arrays = {"x": pyramid["x"], "y": pyramid["levels"][0][1]}
+    for level, (min_x, min_y, max_x, max_y) in enumerate(pyramid["levels"][1:], start=1):
+        arrays[f"{level}.min_x"] = min_x
+        arrays[f"{level}.min_y"] = min_y
+        arrays[f"{level}.max_x"] = max_x
+        arrays[f"{level}.max_y"] = max_y
+    return arrays
+
+
+def unflatten_pyramid(arrays: dict) -> dict:
+    xs, ys = arrays["x"], arrays["y"]
+    levels = [(xs, ys, xs, ys)]
+    level = 1
+    while f"{level}.min_x" in arrays:
+        levels.append(tuple(arrays[f"{level}.{name}"] for name in ("min_x", "min_y", "max_x", "max_y")))
+        level += 1
+    return {"x": xs, "levels": levels}